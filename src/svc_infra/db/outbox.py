@@ -42,13 +42,19 @@ class InMemoryOutboxStore:
     def __init__(self):
         self._seq = 0
         self._messages: list[OutboxMessage] = []
+        # id -> message, so marking a message does not scan the whole outbox
+        self._by_id: dict[int, OutboxMessage] = {}
 
     def enqueue(self, topic: str, payload: dict[str, Any]) -> OutboxMessage:
         self._seq += 1
         msg = OutboxMessage(id=self._seq, topic=topic, payload=dict(payload))
         self._messages.append(msg)
+        self._by_id[msg.id] = msg
         return msg
 
+    def get(self, msg_id: int) -> OutboxMessage | None:
+        return self._by_id.get(msg_id)
+
     def fetch_next(self, *, topics: Iterable[str] | None = None) -> OutboxMessage | None:
         allowed = set(topics) if topics else None
         for msg in self._messages:
@@ -63,16 +69,14 @@ class InMemoryOutboxStore:
         return None
 
     def mark_processed(self, msg_id: int) -> None:
-        for msg in self._messages:
-            if msg.id == msg_id:
-                msg.processed_at = datetime.now(UTC)
-                return
+        msg = self._by_id.get(msg_id)
+        if msg is not None:
+            msg.processed_at = datetime.now(UTC)
 
     def mark_failed(self, msg_id: int) -> None:
-        for msg in self._messages:
-            if msg.id == msg_id:
-                msg.attempts += 1
-                return
+        msg = self._by_id.get(msg_id)
+        if msg is not None:
+            msg.attempts += 1
 
 
 class SqlOutboxStore:
@@ -1,6 +1,7 @@
 from .client import (
     get_default_timeout_seconds,
     make_timeout,
+    merge_request_id_header,
     new_async_httpx_client,
     new_httpx_client,
 )
@@ -10,4 +11,5 @@ __all__ = [
     "new_httpx_client",
     "new_async_httpx_client",
     "make_timeout",
+    "merge_request_id_header",
 ]
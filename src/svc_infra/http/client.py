@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import os
-from contextvars import ContextVar
+from contextvars import ContextVar, Token
+from functools import lru_cache
 from typing import Any
 
 import httpx
@@ -12,9 +13,18 @@ from svc_infra.app.env import pick
 _request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 
-def set_request_id(request_id: str | None) -> None:
-    """Set the current request ID for propagation to outbound HTTP calls."""
-    _request_id_ctx.set(request_id)
+def set_request_id(request_id: str | None) -> Token[str | None]:
+    """Set the current request ID for propagation to outbound HTTP calls.
+
+    Returns a token; prefer ``reset_request_id(token)`` over ``set_request_id(None)``
+    to restore the previous value when the request scope ends.
+    """
+    return _request_id_ctx.set(request_id)
+
+
+def reset_request_id(token: Token[str | None]) -> None:
+    """Restore the request ID that was current before the matching set_request_id()."""
+    _request_id_ctx.reset(token)
 
 
 def get_request_id() -> str | None:
@@ -22,23 +32,48 @@ def get_request_id() -> str | None:
     return _request_id_ctx.get()
 
 
-def _merge_request_id_header(headers: dict[str, str] | None) -> dict[str, str]:
-    """Merge X-Request-Id header into headers dict if request ID is set."""
-    result = dict(headers) if headers else {}
-    request_id = get_request_id()
-    if request_id and "X-Request-Id" not in result:
-        result["X-Request-Id"] = request_id
-    return result
+def merge_request_id_header(headers: dict[str, str] | None) -> dict[str, str]:
+    """Merge X-Request-Id header into headers dict if request ID is set.
 
+    Use it for per-request headers on a shared client that was created with
+    ``propagate_request_id=False``. The input is returned as-is when nothing
+    needs adding; httpx copies request headers, so sharing the dict is safe.
+    """
+    base = headers or {}
+    request_id = _request_id_ctx.get()
+    if not request_id or "X-Request-Id" in base:
+        return base
+    return {**base, "X-Request-Id": request_id}
 
-def _parse_float_env(name: str, default: float) -> float:
-    raw = os.getenv(name)
-    if raw is None or raw == "":
-        return default
+
+def _client_headers(headers: dict[str, str] | None, propagate_request_id: bool) -> httpx.Headers:
+    """Build client headers, adding X-Request-Id from context when propagating.
+
+    Not cached: headers often carry per-call credentials, which must not be kept
+    in a module-level cache, and building them is cheap next to creating a client.
+    """
+    built = httpx.Headers(headers)
+    request_id = _request_id_ctx.get() if propagate_request_id else None
+    if request_id and "X-Request-Id" not in built:
+        built["X-Request-Id"] = request_id
+    return built
+
+
+@lru_cache(maxsize=64)
+def _parse_float(raw: str) -> float | None:
+    # Keyed on the raw env value, so changes to os.environ are always picked up
     try:
         return float(raw)
     except ValueError:
+        return None
+
+
+def _parse_float_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
         return default
+    value = _parse_float(raw)
+    return default if value is None else value
 
 
 def get_default_timeout_seconds() -> float:
@@ -51,10 +86,16 @@ def get_default_timeout_seconds() -> float:
     return _parse_float_env("HTTP_CLIENT_TIMEOUT_SECONDS", default)
 
 
+@lru_cache(maxsize=32)
+def _timeout_for(seconds: float) -> httpx.Timeout:
+    # httpx.Timeout is immutable, so instances can be shared between clients
+    return httpx.Timeout(timeout=seconds)
+
+
 def make_timeout(seconds: float | None = None) -> httpx.Timeout:
     s = seconds if seconds is not None else get_default_timeout_seconds()
     # Apply same timeout for connect/read/write/pool for simplicity
-    return httpx.Timeout(timeout=s)
+    return _timeout_for(s)
 
 
 def new_httpx_client(
@@ -71,9 +112,9 @@ def new_httpx_client(
     If propagate_request_id=True (default), X-Request-Id header is added from context.
     """
     timeout = make_timeout(timeout_seconds)
-    merged_headers = _merge_request_id_header(headers) if propagate_request_id else headers
+    merged_headers = _client_headers(headers, propagate_request_id)
     # httpx doesn't accept base_url=None; only pass if non-None
-    client_kwargs = {"timeout": timeout, "headers": merged_headers, **kwargs}
+    client_kwargs: dict[str, Any] = {"timeout": timeout, "headers": merged_headers, **kwargs}
     if base_url is not None:
         client_kwargs["base_url"] = base_url
     return httpx.Client(**client_kwargs)
@@ -93,9 +134,9 @@ def new_async_httpx_client(
     If propagate_request_id=True (default), X-Request-Id header is added from context.
     """
     timeout = make_timeout(timeout_seconds)
-    merged_headers = _merge_request_id_header(headers) if propagate_request_id else headers
+    merged_headers = _client_headers(headers, propagate_request_id)
     # httpx doesn't accept base_url=None; only pass if non-None
-    client_kwargs = {"timeout": timeout, "headers": merged_headers, **kwargs}
+    client_kwargs: dict[str, Any] = {"timeout": timeout, "headers": merged_headers, **kwargs}
     if base_url is not None:
         client_kwargs["base_url"] = base_url
     return httpx.AsyncClient(**client_kwargs)
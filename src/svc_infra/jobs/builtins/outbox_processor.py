@@ -12,10 +12,13 @@ def make_outbox_tick(
     *,
     topics: Iterable[str] | None = None,
     job_name_prefix: str = "outbox",
+    batch_size: int = 1,
 ):
-    """Return an async task function to move one outbox message into the job queue.
+    """Return an async task function to move outbox messages into the job queue.
 
-    - It fetches at most one unprocessed message per tick to avoid starving others.
+    - It fetches at most ``batch_size`` unprocessed messages per tick (one by
+      default) to avoid starving others; raise it to drain a backlog faster than
+      one message per scheduler interval.
     - The enqueued job name is f"{job_name_prefix}.{topic}" to allow routing.
     - The job payload contains `outbox_id`, `topic`, and original `payload`.
     """
@@ -24,15 +27,18 @@ def make_outbox_tick(
 
     async def _tick():
         # Outbox is sync; this wrapper is async for scheduler compatibility
-        msg = outbox.fetch_next(topics=topics)
-        if not msg:
-            return
-        if msg.id in dispatched:
-            return
-        job_name = f"{job_name_prefix}.{msg.topic}"
-        queue.enqueue(job_name, {"outbox_id": msg.id, "topic": msg.topic, "payload": msg.payload})
-        # mark as dispatched (bump attempts) so it won't be re-enqueued by fetch_next
-        outbox.mark_failed(msg.id)
-        dispatched.add(msg.id)
+        for _ in range(batch_size):
+            msg = outbox.fetch_next(topics=topics)
+            if not msg:
+                return
+            if msg.id in dispatched:
+                return
+            job_name = f"{job_name_prefix}.{msg.topic}"
+            queue.enqueue(
+                job_name, {"outbox_id": msg.id, "topic": msg.topic, "payload": msg.payload}
+            )
+            # mark as dispatched (bump attempts) so it won't be re-enqueued by fetch_next
+            outbox.mark_failed(msg.id)
+            dispatched.add(msg.id)
 
     return _tick
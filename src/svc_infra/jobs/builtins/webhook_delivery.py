@@ -1,13 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from collections.abc import Awaitable, Callable
+
+import httpx
 
 from svc_infra.db.inbox import InboxStore
 from svc_infra.db.outbox import OutboxStore
-from svc_infra.http import get_default_timeout_seconds, new_async_httpx_client
+from svc_infra.http import (
+    get_default_timeout_seconds,
+    merge_request_id_header,
+    new_async_httpx_client,
+)
 from svc_infra.jobs.queue import Job
 from svc_infra.webhooks.encryption import decrypt_secret
-from svc_infra.webhooks.signing import sign
+from svc_infra.webhooks.signing import canonical_body, sign_body
+
+
+class WebhookDeliveryHandler:
+    """Async job handler returned by :func:`make_webhook_handler`.
+
+    Call it with a :class:`Job` to deliver one webhook. Await :meth:`aclose` on
+    shutdown to close the pooled HTTP client it opened.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Job], Awaitable[None]],
+        aclose: Callable[[], Awaitable[None]],
+    ) -> None:
+        self._deliver = deliver
+        self._aclose = aclose
+
+    async def __call__(self, job: Job) -> None:
+        await self._deliver(job)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; a later delivery opens a new one."""
+        await self._aclose()
 
 
 def make_webhook_handler(
@@ -17,12 +48,48 @@ def make_webhook_handler(
     get_webhook_url_for_topic,
     get_secret_for_topic,
     header_name: str = "X-Signature",
-):
+) -> WebhookDeliveryHandler:
     """Return an async job handler to deliver webhooks.
 
     Expected job payload shape:
     {"outbox_id": int, "topic": str, "payload": {...}}
+
+    Deliveries made by one handler share a pooled HTTP client, so retries and
+    repeat deliveries to the same endpoint reuse open connections. The client
+    is created on the first delivery, with the timeout configured at that time,
+    and is replaced if deliveries move to another event loop. Call
+    ``await handler.aclose()`` on shutdown to close it.
     """
+    client: httpx.AsyncClient | None = None
+    client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_client() -> httpx.AsyncClient:
+        nonlocal client, client_loop
+        loop = asyncio.get_running_loop()
+        if client is None or client_loop is not loop:
+            # Derive timeout: dedicated WEBHOOK_DELIVERY_TIMEOUT_SECONDS or default HTTP client timeout
+            timeout_seconds = None
+            env_timeout = os.getenv("WEBHOOK_DELIVERY_TIMEOUT_SECONDS")
+            if env_timeout:
+                try:
+                    timeout_seconds = float(env_timeout)
+                except ValueError:
+                    timeout_seconds = get_default_timeout_seconds()
+            else:
+                timeout_seconds = get_default_timeout_seconds()
+            # The request id is added per delivery below, not frozen into the shared client
+            # A client opened on another (typically finished) loop cannot be reused here
+            client = new_async_httpx_client(
+                timeout_seconds=timeout_seconds, propagate_request_id=False
+            )
+            client_loop = loop
+        return client
+
+    async def _aclose() -> None:
+        nonlocal client, client_loop
+        if client is not None:
+            current, client, client_loop = client, None, None
+            await current.aclose()
 
     async def _handler(job: Job) -> None:
         data = job.payload or {}
@@ -52,8 +119,11 @@ def make_webhook_handler(
             url = get_webhook_url_for_topic(topic)
             secret = get_secret_for_topic(topic)
             subscription_id = None
-        sig = sign(secret, delivery_payload)
+        # Send the exact bytes that were signed, so the body is encoded only once
+        body = canonical_body(delivery_payload)
+        sig = sign_body(secret, body)
         headers = {
+            "Content-Type": "application/json",
             header_name: sig,
             "X-Event-Id": str(outbox_id),
             "X-Topic": str(topic),
@@ -69,25 +139,13 @@ def make_webhook_handler(
             version = delivery_payload.get("version")
         if version is not None:
             headers["X-Payload-Version"] = str(version)
-        # Derive timeout: dedicated WEBHOOK_DELIVERY_TIMEOUT_SECONDS or default HTTP client timeout
-        timeout_seconds = None
-        env_timeout = os.getenv("WEBHOOK_DELIVERY_TIMEOUT_SECONDS")
-        if env_timeout:
-            try:
-                timeout_seconds = float(env_timeout)
-            except ValueError:
-                timeout_seconds = get_default_timeout_seconds()
-        else:
-            timeout_seconds = get_default_timeout_seconds()
-
-        async with new_async_httpx_client(timeout_seconds=timeout_seconds) as client:
-            resp = await client.post(url, json=delivery_payload, headers=headers)
-            if 200 <= resp.status_code < 300:
-                # record delivery and mark processed
-                inbox.mark_if_new(key, ttl_seconds=24 * 3600)
-                outbox.mark_processed(int(outbox_id))
-                return
-            # allow retry on non-2xx: raise to trigger fail/backoff
-            raise RuntimeError(f"webhook delivery failed: {resp.status_code}")
-
-    return _handler
+        resp = await _get_client().post(url, content=body, headers=merge_request_id_header(headers))
+        if 200 <= resp.status_code < 300:
+            # record delivery and mark processed
+            inbox.mark_if_new(key, ttl_seconds=24 * 3600)
+            outbox.mark_processed(int(outbox_id))
+            return
+        # allow retry on non-2xx: raise to trigger fail/backoff
+        raise RuntimeError(f"webhook delivery failed: {resp.status_code}")
+
+    return WebhookDeliveryHandler(_handler, _aclose)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import random
 import warnings
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
@@ -29,6 +30,20 @@ def _check_inmemory_production_warning(class_name: str) -> None:
         logger.critical(msg)
 
 
+def _retry_delay_seconds(backoff_seconds: int, attempts: int) -> float:
+    """Delay before retrying a failed job.
+
+    Grows with the attempt count (``backoff_seconds * attempts``) and is spread
+    over the upper half of that window so jobs that failed together, e.g.
+    webhook deliveries to an endpoint that went down, do not all retry at once.
+    A zero backoff stays zero.
+    """
+    delay = backoff_seconds * max(1, attempts)
+    if delay <= 0:
+        return 0.0
+    return random.uniform(delay / 2, delay)
+
+
 @dataclass
 class Job:
     id: str
@@ -98,8 +113,7 @@ class InMemoryJobQueue:
         for job in self._jobs:
             if job.id == job_id:
                 job.last_error = error
-                # Exponential backoff: base * attempts
-                delay = job.backoff_seconds * max(1, job.attempts)
+                delay = _retry_delay_seconds(job.backoff_seconds, job.attempts)
                 if delay > 0:
                     # Add a tiny fudge so an immediate subsequent poll in ultra-fast
                     # environments (like our acceptance API) doesn't re-reserve the job.
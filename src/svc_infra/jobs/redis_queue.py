@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 from dataclasses import asdict
 from datetime import UTC, datetime
 from typing import Any, cast
 
 from redis import Redis
 
-from .queue import Job, JobQueue
+from .queue import Job, JobQueue, _retry_delay_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -230,7 +231,7 @@ class RedisJobQueue(JobQueue):
             self._r.zrem(self._k("processing_vt"), job_id)
             self._r.lpush(self._k("dlq"), job_id)
             return
-        delay = backoff_seconds * max(1, attempts)
+        delay = math.ceil(_retry_delay_seconds(backoff_seconds, attempts))
         available_at_ts = now_ts + delay
         mapping: dict[str, str] = {
             "last_error": error or "",
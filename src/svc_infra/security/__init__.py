@@ -53,6 +53,7 @@ from .add import add_security
 from .audit import (
     AuditEvent,
     AuditLogStore,
+    AuditWriter,
     InMemoryAuditLogStore,
     append_audit_event,
     verify_audit_chain,
@@ -137,6 +138,7 @@ __all__ = [
     "verify_cookie",
     # Audit logging
     "AuditLogStore",
+    "AuditWriter",
     "AuditEvent",
     "append_audit_event",
     "verify_audit_chain",
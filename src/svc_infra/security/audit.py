@@ -13,9 +13,15 @@ Design notes:
 
 from __future__ import annotations
 
+import asyncio
+import hmac
+import weakref
+from collections import defaultdict, deque
 from collections.abc import Sequence
+from contextlib import AbstractAsyncContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from itertools import islice
 from typing import Any, Protocol
 
 try:  # SQLAlchemy may not be present in minimal test context
@@ -27,8 +33,13 @@ except Exception:  # pragma: no cover
 
 from svc_infra.security.models import AuditLog, compute_audit_hash
 
+_GENESIS_HASH = "0" * 64
 
-@dataclass(frozen=True)
+# (row, the tenant's previous last row, future resolved once the row is flushed)
+_QueuedRow = tuple[AuditLog, AuditLog | None, "asyncio.Future[None]"]
+
+
+@dataclass(frozen=True, slots=True)
 class AuditEvent:
     ts: datetime
     actor_id: Any
@@ -70,6 +81,8 @@ class InMemoryAuditLogStore:
 
     def __init__(self):
         self._events: list[AuditEvent] = []
+        # Per-tenant index so tenant-scoped listing doesn't scan every event
+        self._by_tenant: defaultdict[str | None, deque[AuditEvent]] = defaultdict(deque)
 
     def append(
         self,
@@ -90,52 +103,161 @@ class InMemoryAuditLogStore:
             metadata=dict(metadata or {}),
         )
         self._events.append(event)
+        self._by_tenant[tenant_id].append(event)
         return event
 
     def list(self, *, tenant_id: str | None = None, limit: int | None = None) -> list[AuditEvent]:
-        out = [e for e in self._events if tenant_id is None or e.tenant_id == tenant_id]
+        source = self._events if tenant_id is None else self._by_tenant.get(tenant_id, ())
+        if limit is not None and int(limit) > 0:
+            out = list(islice(reversed(source), int(limit)))
+            out.reverse()
+            return out
+        out = list(source)
         if limit is not None:
             return out[-int(limit) :]
         return out
 
 
-async def append_audit_event(
-    db: Any,
-    *,
-    actor_id=None,
-    tenant_id: str | None = None,
-    event_type: str,
-    resource_ref: str | None = None,
-    metadata: dict | None = None,
-    ts: datetime | None = None,
-    prev_event: AuditLog | None = None,
-) -> AuditLog:
-    """Append an audit event returning the persisted row.
+class AuditWriter:
+    """Coalesces audit rows into batched writes on a single background task.
 
-    If prev_event is not supplied, it attempts to fetch the latest event for
-    the tenant (or global chain when tenant_id is None).
+    Rows submitted within ``flush_interval`` seconds (up to ``batch_size``) are
+    added together and flushed once, amortising the flush round-trip under load.
+    ``submit`` returns only after the batch holding the row has been flushed.
+    The writer also remembers the last row per tenant so chained appends do not
+    need to read back rows that are still queued. If a flush fails, that memory
+    is rolled back and queued rows chained from the failed rows are failed too,
+    so the stored chain never links to a row that was not persisted.
+
+    Callers that pick a row's predecessor themselves must hold
+    ``tenant_lock(tenant_id)`` from that lookup until ``enqueue`` returns, so
+    concurrent appends for one tenant cannot chain from the same row.
     """
-    metadata = metadata or {}
-    ts = ts or datetime.now(UTC)
 
-    prev_hash: str | None = None
-    if prev_event is not None:
-        prev_hash = prev_event.hash
-    elif select is not None and hasattr(db, "execute"):  # attempt DB lookup for previous event
+    def __init__(self, db: Any, *, batch_size: int = 100, flush_interval: float = 0.01):
+        self._db = db
+        self._batch_size = max(1, int(batch_size))
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[_QueuedRow] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+        self._last: dict[str | None, AuditLog] = {}
+        # Hash of each row that failed to persist during the current drain, mapped
+        # to the nearest persisted row before it in the tenant's chain
+        self._failed: dict[str, AuditLog | None] = {}
+        # Held across predecessor lookup -> hash -> enqueue; dropped once unused
+        self._locks: weakref.WeakValueDictionary[str | None, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def last_event(self, tenant_id: str | None) -> AuditLog | None:
+        return self._last.get(tenant_id)
+
+    def tenant_lock(self, tenant_id: str | None) -> asyncio.Lock:
+        lock = self._locks.get(tenant_id)
+        if lock is None:
+            lock = self._locks[tenant_id] = asyncio.Lock()
+        return lock
+
+    def enqueue(self, row: AuditLog) -> asyncio.Future[None]:
+        """Queue row as the tenant's new last event; the future resolves once it is flushed."""
+        prev = self._last.get(row.tenant_id)
+        self._last[row.tenant_id] = row
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, prev, fut))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+        return fut
+
+    async def submit(self, row: AuditLog) -> None:
+        await self.enqueue(row)
+
+    async def _drain(self) -> None:
+        # Runs until the queue is empty; submit() restarts it on demand
         try:
-            stmt = (
-                select(AuditLog)
-                .where(AuditLog.tenant_id == tenant_id)
-                .order_by(AuditLog.id.desc())
-                .limit(1)
-            )
-            result = await db.execute(stmt)
-            prev = result.scalars().first()
-            if prev:
-                prev_hash = prev.hash
-        except Exception:  # pragma: no cover - defensive for minimal fakes
-            pass
+            while not self._queue.empty():
+                if self._queue.qsize() < self._batch_size:
+                    await asyncio.sleep(self._flush_interval)
+                count = min(self._batch_size, self._queue.qsize())
+                await self._write([self._queue.get_nowait() for _ in range(count)])
+        finally:
+            self._failed.clear()
 
+    async def _write(self, batch: list[_QueuedRow]) -> None:
+        if self._failed:
+            # Rows chained from a failed row would persist a link to a missing row
+            kept: list[_QueuedRow] = []
+            for item in batch:
+                if item[0].prev_hash in self._failed:
+                    self._fail([item], RuntimeError("audit row chains from an unpersisted row"))
+                else:
+                    kept.append(item)
+            batch = kept
+        rows = [row for row, _, _ in batch]
+        error: BaseException | None = None
+        try:
+            if rows:
+                if hasattr(self._db, "add_all"):
+                    self._db.add_all(rows)
+                else:
+                    for row in rows:
+                        self._db.add(row)
+                if hasattr(self._db, "flush"):
+                    await self._db.flush()
+        except Exception as exc:
+            error = exc
+        if error is not None:
+            self._fail(batch, error)
+            return
+        for _, _, fut in batch:
+            if not fut.done():  # submitter may have been cancelled
+                fut.set_result(None)
+
+    def _fail(self, batch: list[_QueuedRow], error: BaseException) -> None:
+        for row, prev, _ in batch:
+            # Skip back over predecessors that failed too, to the last persisted row
+            if prev is not None and prev.hash in self._failed:
+                prev = self._failed[prev.hash]
+            self._failed[row.hash] = prev
+            if self._last.get(row.tenant_id) is row:
+                if prev is None:
+                    self._last.pop(row.tenant_id, None)
+                else:
+                    self._last[row.tenant_id] = prev
+        for _, _, fut in batch:
+            if not fut.done():
+                fut.set_exception(error)
+
+
+async def _latest_hash(db: Any, tenant_id: str | None) -> str | None:
+    """Return the hash of the tenant's latest stored event, if it can be looked up."""
+    if select is None or not hasattr(db, "execute"):
+        return None
+    try:
+        stmt = (
+            select(AuditLog)
+            .where(AuditLog.tenant_id == tenant_id)
+            .order_by(AuditLog.id.desc())
+            .limit(1)
+        )
+        result = await db.execute(stmt)
+        prev: AuditLog | None = result.scalars().first()
+        if prev:
+            return prev.hash
+    except Exception:  # pragma: no cover - defensive for minimal fakes
+        pass
+    return None
+
+
+def _chained_row(
+    prev_hash: str | None,
+    *,
+    ts: datetime,
+    actor_id: Any,
+    tenant_id: str | None,
+    event_type: str,
+    resource_ref: str | None,
+    metadata: dict,
+) -> AuditLog:
     new_hash = compute_audit_hash(
         prev_hash,
         ts=ts,
@@ -145,17 +267,68 @@ async def append_audit_event(
         resource_ref=resource_ref,
         metadata=metadata,
     )
-
-    row = AuditLog(
+    return AuditLog(
         ts=ts,
         actor_id=actor_id,
         tenant_id=tenant_id,
         event_type=event_type,
         resource_ref=resource_ref,
         event_metadata=metadata,
-        prev_hash=prev_hash or "0" * 64,
+        prev_hash=prev_hash or _GENESIS_HASH,
         hash=new_hash,
     )
+
+
+async def append_audit_event(
+    db: Any,
+    *,
+    actor_id=None,
+    tenant_id: str | None = None,
+    event_type: str,
+    resource_ref: str | None = None,
+    metadata: dict | None = None,
+    ts: datetime | None = None,
+    prev_event: AuditLog | None = None,
+    writer: AuditWriter | None = None,
+) -> AuditLog:
+    """Append an audit event returning the persisted row.
+
+    If prev_event is not supplied, it attempts to fetch the latest event for
+    the tenant (or global chain when tenant_id is None). When a writer is given,
+    the row is persisted through its batched flush instead of a flush per event,
+    and the predecessor is chosen under the writer's per-tenant lock so
+    concurrent appends extend one chain instead of forking it.
+    """
+    metadata = metadata or {}
+    ts = ts or datetime.now(UTC)
+
+    lock: AbstractAsyncContextManager[Any] = (
+        writer.tenant_lock(tenant_id) if writer is not None else nullcontext()
+    )
+    async with lock:
+        if prev_event is None and writer is not None:
+            prev_event = writer.last_event(tenant_id)
+        prev_hash: str | None
+        if prev_event is not None:
+            prev_hash = prev_event.hash
+        else:  # attempt DB lookup for previous event
+            prev_hash = await _latest_hash(db, tenant_id)
+        row = _chained_row(
+            prev_hash,
+            ts=ts,
+            actor_id=actor_id,
+            tenant_id=tenant_id,
+            event_type=event_type,
+            resource_ref=resource_ref,
+            metadata=metadata,
+        )
+        if writer is not None:
+            flushed = writer.enqueue(row)
+
+    if writer is not None:
+        # Wait for the batched flush outside the lock so other appends can join the batch
+        await flushed
+        return row
     if hasattr(db, "add"):
         try:
             db.add(row)
@@ -169,6 +342,11 @@ async def append_audit_event(
     return row
 
 
+def _digest_eq(stored: str | None, expected: str) -> bool:
+    # Constant-time compare so verification timing doesn't leak how much of a digest matched
+    return hmac.compare_digest((stored or "").encode(), expected.encode())
+
+
 def verify_audit_chain(events: Sequence[AuditLog]) -> tuple[bool, list[int]]:
     """Verify a sequence of audit events.
 
@@ -177,10 +355,13 @@ def verify_audit_chain(events: Sequence[AuditLog]) -> tuple[bool, list[int]]:
     checked so callers can analyze extent of tampering.
     """
     broken: list[int] = []
-    prev_hash = "0" * 64
+    prev_hash = _GENESIS_HASH
     for idx, ev in enumerate(events):
+        # The recomputed hash always chains from the stored prev_hash; a broken
+        # link to the previous event is detected separately below.
+        stored_prev = ev.prev_hash
         expected = compute_audit_hash(
-            prev_hash if ev.prev_hash == prev_hash else ev.prev_hash,
+            stored_prev,
             ts=ev.ts,
             actor_id=ev.actor_id,
             tenant_id=ev.tenant_id,
@@ -189,15 +370,10 @@ def verify_audit_chain(events: Sequence[AuditLog]) -> tuple[bool, list[int]]:
             metadata=ev.event_metadata,
         )
         # prev_hash stored should equal previous event hash (or zeros for genesis)
-        if (idx == 0 and ev.prev_hash != "0" * 64) or (
-            idx > 0 and ev.prev_hash != events[idx - 1].hash
-        ):
-            broken.append(idx)
-        if ev.hash != expected:
+        if not (_digest_eq(stored_prev, prev_hash) and _digest_eq(ev.hash, expected)):
             broken.append(idx)
         prev_hash = ev.hash
-    ok = not broken
-    return ok, sorted(set(broken))
+    return not broken, broken
 
 
 __all__ = [
@@ -206,4 +382,5 @@ __all__ = [
     "AuditEvent",
     "AuditLogStore",
     "InMemoryAuditLogStore",
+    "AuditWriter",
 ]
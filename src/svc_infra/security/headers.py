@@ -1,27 +1,33 @@
 from __future__ import annotations
 
-SECURE_DEFAULTS = {
-    "Strict-Transport-Security": "max-age=63072000; includeSubDomains; preload",
-    "X-Content-Type-Options": "nosniff",
-    "X-Frame-Options": "DENY",
-    "Referrer-Policy": "strict-origin-when-cross-origin",
-    "X-XSS-Protection": "0",
-    # CSP with practical defaults - allows inline styles/scripts and data URIs for images
-    # Also allows cdn.jsdelivr.net for FastAPI docs (Swagger UI, ReDoc)
-    # Still secure: blocks arbitrary external scripts, prevents framing, restricts form actions
-    # Override via headers_overrides in add_security() for stricter or custom policies
-    "Content-Security-Policy": (
-        "default-src 'self'; "
-        "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-        "img-src 'self' data: https:; "
-        "connect-src 'self'; "
-        "font-src 'self' https://cdn.jsdelivr.net; "
-        "frame-ancestors 'none'; "
-        "base-uri 'self'; "
-        "form-action 'self'"
-    ),
-}
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# Read-only so per-app overrides can never leak into the shared defaults
+SECURE_DEFAULTS: Mapping[str, str] = MappingProxyType(
+    {
+        "Strict-Transport-Security": "max-age=63072000; includeSubDomains; preload",
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "X-XSS-Protection": "0",
+        # CSP with practical defaults - allows inline styles/scripts and data URIs for images
+        # Also allows cdn.jsdelivr.net for FastAPI docs (Swagger UI, ReDoc)
+        # Still secure: blocks arbitrary external scripts, prevents framing, restricts form actions
+        # Override via headers_overrides in add_security() for stricter or custom policies
+        "Content-Security-Policy": (
+            "default-src 'self'; "
+            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+            "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+            "img-src 'self' data: https:; "
+            "connect-src 'self'; "
+            "font-src 'self' https://cdn.jsdelivr.net; "
+            "frame-ancestors 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self'"
+        ),
+    }
+)
 
 
 class SecurityHeadersMiddleware:
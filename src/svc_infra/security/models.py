@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import uuid
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache, partial
 
 from sqlalchemy import (
     JSON,
@@ -236,8 +239,38 @@ def compute_audit_hash(
     resource_ref: str | None,
     metadata: dict,
 ) -> str:
-    """Compute SHA256 hash chaining previous hash + canonical event payload."""
-    prev = prev_hash or "0" * 64
+    """Compute the hash chaining previous hash + canonical event payload.
+
+    SHA-256 by default, or BLAKE2b-256 when ``AUDIT_HASH_ALGO=blake2b``.
+    """
+    hasher = _audit_hasher()((prev_hash or "0" * 64).encode())
+    hasher.update(
+        _canonical_bytes(
+            ts=ts,
+            actor_id=actor_id,
+            tenant_id=tenant_id,
+            event_type=event_type,
+            resource_ref=resource_ref,
+            metadata=metadata,
+        )
+    )
+    return hasher.hexdigest()
+
+
+# Reused across calls; json.dumps would build a new encoder for these options every time
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+
+
+def _canonical_bytes(
+    *,
+    ts: datetime,
+    actor_id: uuid.UUID | None,
+    tenant_id: str | None,
+    event_type: str,
+    resource_ref: str | None,
+    metadata: dict,
+) -> bytes:
+    """Serialise an audit event to the canonical JSON bytes covered by its hash."""
     payload = {
         "ts": ts.isoformat(),
         "actor_id": str(actor_id) if actor_id else None,
@@ -246,8 +279,24 @@ def compute_audit_hash(
         "resource_ref": resource_ref,
         "metadata": metadata,
     }
-    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256((prev + canonical).encode()).hexdigest()
+    return _CANONICAL_ENCODER.encode(payload).encode()
+
+
+@lru_cache(maxsize=1)
+def _audit_hasher() -> Callable[[bytes], hashlib._Hash | hashlib.blake2b]:
+    """Return the audit hash constructor, resolved once from AUDIT_HASH_ALGO.
+
+    AUDIT_HASH_ALGO=blake2b opts in to BLAKE2b-256, which is faster than SHA-256 on
+    short payloads. The setting is read on first use and then fixed for the process,
+    so a chain never switches algorithm part-way; every writer and verifier of a
+    chain must use the same setting.
+    """
+    algo = os.getenv("AUDIT_HASH_ALGO", "sha256").lower()
+    if algo == "sha256":
+        return hashlib.sha256
+    if algo == "blake2b":
+        return partial(hashlib.blake2b, digest_size=32)
+    raise ValueError(f"Unsupported AUDIT_HASH_ALGO: {algo!r} (expected 'sha256' or 'blake2b')")
 
 
 def rotate_refresh_token(
@@ -3,8 +3,10 @@ from __future__ import annotations
 import base64
 import hmac
 import json
+import threading
 import time
-from hashlib import sha256
+from collections import OrderedDict
+from hashlib import blake2b
 from typing import Any
 
 
@@ -12,19 +14,69 @@ def _b64e(b: bytes) -> str:
     return base64.urlsafe_b64encode(b).rstrip(b"=").decode()
 
 
+_PADDING = ("", "=", "==", "===")
+
+
 def _b64d(s: str) -> bytes:
-    pad = "=" * (-len(s) % 4)
-    return base64.urlsafe_b64decode((s + pad).encode())
+    # The decoder accepts ASCII str directly; a table lookup avoids building the pad
+    return base64.urlsafe_b64decode(s + _PADDING[-len(s) & 3])
 
 
 def _sign(data: bytes, key: bytes) -> str:
-    return _b64e(hmac.new(key, data, sha256).digest())
+    # One-shot C HMAC; avoids building an hmac.HMAC object per sign/verify
+    return _b64e(hmac.digest(key, data, "sha256"))
+
+
+def _dumps(body: dict[str, Any]) -> bytes:
+    # Compact, key-sorted JSON so the signed bytes are stable across processes
+    return json.dumps(body, separators=(",", ":"), sort_keys=True).encode()
 
 
 def _now() -> int:
     return int(time.time())
 
 
+# Bounded LRU of cookie values whose signature already verified, so repeat checks
+# of the same session cookie skip base64 decoding and HMAC. Only successes are
+# cached: forged cookies cannot evict real ones. Expiry and scope are re-checked
+# on every call by verify_cookie.
+_VERIFY_CACHE_MAXSIZE = 8192
+_verify_cache: OrderedDict[tuple[str, bytes, tuple[bytes, ...]], bytes] = OrderedDict()
+_verify_lock = threading.Lock()
+
+
+def _key_id(key: str) -> bytes:
+    # Cache entries are keyed by a digest so secrets are never held as cache keys
+    return blake2b(key.encode(), digest_size=16).digest()
+
+
+def _verified_data(
+    value: str, body_b64: str, sig: str, key: str, old_keys: list[str] | None
+) -> bytes | None:
+    """Return the cookie body if its signature matches key or an old key, else None."""
+    cache_key = (value, _key_id(key), tuple(_key_id(k) for k in old_keys or ()))
+    with _verify_lock:
+        cached = _verify_cache.get(cache_key)
+        if cached is not None:
+            _verify_cache.move_to_end(cache_key)
+            return cached
+
+    data = _b64d(body_b64)
+    if not hmac.compare_digest(sig, _sign(data, key.encode())):
+        # try old keys
+        for k in old_keys or []:
+            if hmac.compare_digest(sig, _sign(data, k.encode())):
+                break
+        else:
+            return None
+
+    with _verify_lock:
+        _verify_cache[cache_key] = data
+        if len(_verify_cache) > _VERIFY_CACHE_MAXSIZE:
+            _verify_cache.popitem(last=False)
+    return data
+
+
 def sign_cookie(
     payload: dict[str, Any],
     *,
@@ -48,7 +100,7 @@ def sign_cookie(
         body.setdefault("_path", path)
     if domain is not None:
         body.setdefault("_domain", domain)
-    data = json.dumps(body, separators=(",", ":"), sort_keys=True).encode()
+    data = _dumps(body)
     sig = _sign(data, key.encode())
     return f"{_b64e(data)}.{sig}"
 
@@ -68,20 +120,14 @@ def verify_cookie(
     If expected_path or expected_domain is provided, verifies the cookie was signed
     for that scope (prevents replay attacks across paths/domains).
     """
-    if not value or "." not in value:
+    body_b64, sep, sig = value.partition(".") if value else ("", "", "")
+    if not sep or not body_b64 or not sig:
         return False, None
-    body_b64, sig = value.split(".", 1)
     try:
-        data = _b64d(body_b64)
-        expected = _sign(data, key.encode())
-        if not hmac.compare_digest(sig, expected):
-            # try old keys
-            for k in old_keys or []:
-                if hmac.compare_digest(sig, _sign(data, k.encode())):
-                    break
-            else:
-                return False, None
-        payload = json.loads(data.decode())
+        data = _verified_data(value, body_b64, sig, key, old_keys)
+        if data is None:
+            return False, None
+        payload = json.loads(data)
         # Expire when current time reaches or exceeds exp
         if "exp" in payload and _now() >= int(payload["exp"]):
             return False, None
@@ -26,34 +26,65 @@ Example:
 
 from __future__ import annotations
 
+import bisect
+import fnmatch
+import heapq
+import itertools
+import re
 import time
 import uuid
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from typing import Any, TypeVar
 
 # Type variable for generic model creation
 T = TypeVar("T")
 
+# Characters that make a glob pattern more than a literal prefix
+_GLOB_METACHARS = frozenset("*?[")
+
 
 # =============================================================================
 # Mock Cache
 # =============================================================================
 
 
-@dataclass
+@lru_cache(maxsize=256)
+def _glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a glob pattern to a regex, cached across calls."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _glob_prefix(pattern: str) -> str | None:
+    """Return the literal prefix of a ``prefix*`` glob, or None for other patterns."""
+    if not pattern.endswith("*"):
+        return None
+    head = pattern[:-1]
+    if _GLOB_METACHARS.intersection(head):
+        return None
+    return head
+
+
+@dataclass(slots=True)
 class CacheEntry:
     """Internal representation of a cached value."""
 
     value: Any
     expires_at: float | None = None  # Unix timestamp
 
-    def is_expired(self) -> bool:
-        """Check if this entry has expired."""
+    def is_expired(self, now: float | None = None) -> bool:
+        """
+        Check if this entry has expired.
+
+        Args:
+            now: Current Unix timestamp; pass one sampled once to check many
+                entries against the same instant (default: time.time())
+        """
         if self.expires_at is None:
             return False
-        return time.time() > self.expires_at
+        return (time.time() if now is None else now) > self.expires_at
 
 
 class MockCache:
@@ -64,7 +95,7 @@ class MockCache:
     Redis or other cache backends without external dependencies.
 
     Features:
-    - TTL support with expiration
+    - TTL support with expiration (expired keys are also swept periodically)
     - Key prefix namespacing
     - Pattern-based key deletion
     - Thread-safe for single-threaded tests
@@ -79,21 +110,81 @@ class MockCache:
         True
     """
 
-    def __init__(self, prefix: str = "test"):
+    def __init__(self, prefix: str = "test", cleanup_interval: int = 64):
         """
         Initialize mock cache.
 
         Args:
             prefix: Key prefix for namespacing (default: "test")
+            cleanup_interval: Number of get() calls between sweeps that evict
+                every expired key, so keys that are never read again do not
+                accumulate (default: 64)
         """
         self.prefix = prefix
+        self.cleanup_interval = cleanup_interval
+        self._ops_since_sweep = 0
+        self._expiry_heap: list[tuple[float, str]] = []  # (expires_at, full key)
         self._store: dict[str, CacheEntry] = {}
+        self._keys_sorted: list[str] = []  # sorted full keys, for prefix lookups
         self._tags: dict[str, set[str]] = {}  # tag -> set of keys
+        self._tags_of: dict[str, list[str]] = {}  # key -> its tags
 
     def _prefixed_key(self, key: str) -> str:
         """Get the full key with prefix."""
         return f"{self.prefix}:{key}"
 
+    def _remove(self, full_key: str) -> None:
+        """Remove a stored key and its sorted-index and tag-index entries."""
+        del self._store[full_key]
+        i = bisect.bisect_left(self._keys_sorted, full_key)
+        if i < len(self._keys_sorted) and self._keys_sorted[i] == full_key:
+            del self._keys_sorted[i]
+        self._untag(full_key)
+
+    def _untag(self, full_key: str) -> None:
+        """Drop a key from every tag it was stored under."""
+        for tag in self._tags_of.pop(full_key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(full_key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _sweep(self, now: float) -> None:
+        """Evict every key whose scheduled expiry has passed."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, full_key = heapq.heappop(heap)
+            entry = self._store.get(full_key)
+            # Skip heap entries left behind by an overwrite or delete
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(full_key)
+
+    def _match(self, pattern: str | re.Pattern[str]) -> list[str]:
+        """
+        Get all stored full keys matching a glob pattern.
+
+        ``prefix*`` patterns are served from the sorted key index; any other
+        pattern is matched with a cached compiled regex. A precompiled regex
+        is matched against the unprefixed key.
+        """
+        if isinstance(pattern, re.Pattern):
+            prefix_len = len(self.prefix) + 1  # +1 for the colon
+            rx_match = pattern.match
+            return [k for k in self._store if rx_match(k[prefix_len:])]
+        full_pattern = self._prefixed_key(pattern)
+        head = _glob_prefix(full_pattern)
+        if head is not None:
+            keys = self._keys_sorted
+            matched = []
+            for i in range(bisect.bisect_left(keys, head), len(keys)):
+                if not keys[i].startswith(head):
+                    break
+                matched.append(keys[i])
+            return matched
+        match = _glob_to_regex(full_pattern).match
+        return [k for k in self._store if match(k)]
+
     def get(self, key: str) -> Any | None:
         """
         Get a value from the cache.
@@ -104,12 +195,17 @@ class MockCache:
         Returns:
             Cached value or None if not found/expired
         """
+        self._ops_since_sweep += 1
+        if self._ops_since_sweep >= self.cleanup_interval:
+            self._ops_since_sweep = 0
+            self._sweep(time.time())
+
         full_key = self._prefixed_key(key)
         entry = self._store.get(full_key)
         if entry is None:
             return None
         if entry.is_expired():
-            del self._store[full_key]
+            self._remove(full_key)
             return None
         return entry.value
 
@@ -127,18 +223,23 @@ class MockCache:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (None for no expiration)
-            tags: Optional list of tags for grouped invalidation
+            tags: Optional list of tags for grouped invalidation. Setting an
+                existing key replaces its previous tags.
         """
         full_key = self._prefixed_key(key)
         expires_at = time.time() + ttl if ttl else None
+        if full_key not in self._store:
+            bisect.insort(self._keys_sorted, full_key)
         self._store[full_key] = CacheEntry(value=value, expires_at=expires_at)
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, full_key))
 
         # Track tags
+        self._untag(full_key)
         if tags:
             for tag in tags:
-                if tag not in self._tags:
-                    self._tags[tag] = set()
-                self._tags[tag].add(full_key)
+                self._tags.setdefault(tag, set()).add(full_key)
+            self._tags_of[full_key] = list(tags)
 
     def delete(self, key: str) -> bool:
         """
@@ -152,26 +253,24 @@ class MockCache:
         """
         full_key = self._prefixed_key(key)
         if full_key in self._store:
-            del self._store[full_key]
+            self._remove(full_key)
             return True
         return False
 
-    def delete_pattern(self, pattern: str) -> int:
+    def delete_pattern(self, pattern: str | re.Pattern[str]) -> int:
         """
         Delete all keys matching a pattern.
 
         Args:
-            pattern: Pattern with * as wildcard (e.g., "user:*")
+            pattern: Pattern with * as wildcard (e.g., "user:*"), or a
+                compiled regex matched against keys without the prefix
 
         Returns:
             Number of keys deleted
         """
-        import fnmatch
-
-        full_pattern = self._prefixed_key(pattern)
-        to_delete = [k for k in self._store if fnmatch.fnmatch(k, full_pattern)]
+        to_delete = self._match(pattern)
         for key in to_delete:
-            del self._store[key]
+            self._remove(key)
         return len(to_delete)
 
     def delete_by_tag(self, tag: str) -> int:
@@ -185,12 +284,9 @@ class MockCache:
             Number of keys deleted
         """
         keys = self._tags.pop(tag, set())
-        count = 0
         for key in keys:
-            if key in self._store:
-                del self._store[key]
-                count += 1
-        return count
+            self._remove(key)
+        return len(keys)
 
     def exists(self, key: str) -> bool:
         """
@@ -207,35 +303,34 @@ class MockCache:
     def clear(self) -> None:
         """Clear all cached values."""
         self._store.clear()
+        self._keys_sorted.clear()
         self._tags.clear()
+        self._tags_of.clear()
+        self._expiry_heap.clear()
 
-    def keys(self, pattern: str = "*") -> list[str]:
+    def keys(self, pattern: str | re.Pattern[str] = "*") -> list[str]:
         """
         Get all keys matching a pattern.
 
         Args:
-            pattern: Pattern with * as wildcard
+            pattern: Pattern with * as wildcard, or a compiled regex matched
+                against keys without the prefix
 
         Returns:
             List of matching keys (without prefix)
         """
-        import fnmatch
-
-        full_pattern = self._prefixed_key(pattern)
         prefix_len = len(self.prefix) + 1  # +1 for the colon
-        return [
-            k[prefix_len:]
-            for k in self._store
-            if fnmatch.fnmatch(k, full_pattern) and not self._store[k].is_expired()
-        ]
+        now = time.time()
+        store = self._store
+        return [k[prefix_len:] for k in self._match(pattern) if not store[k].is_expired(now)]
 
     def size(self) -> int:
         """Get the number of cached items (excluding expired)."""
         # Clean up expired entries
         now = time.time()
-        self._store = {
-            k: v for k, v in self._store.items() if v.expires_at is None or v.expires_at > now
-        }
+        expired = [k for k, v in self._store.items() if v.is_expired(now)]
+        for key in expired:
+            self._remove(key)
         return len(self._store)
 
 
@@ -289,19 +384,26 @@ class MockJobQueue:
         Initialize mock job queue.
 
         Args:
-            sync_mode: If True, execute jobs immediately on enqueue
+            sync_mode: If True, execute jobs immediately on enqueue when a
+                handler is registered; other jobs are queued as usual
         """
         self.sync_mode = sync_mode
-        self._seq = 0
-        self._jobs: list[MockJob] = []
+        self._ids = itertools.count(1)
+        # Pending jobs as (available_at, insertion order, job); the counter
+        # keeps FIFO order for equal times and avoids comparing jobs
+        self._heap: list[tuple[datetime, int, MockJob]] = []
+        self._push_seq = itertools.count()
         self._handlers: dict[str, Callable[[dict[str, Any]], Any]] = {}
         self._completed: list[MockJob] = []
         self._failed: list[MockJob] = []
 
     def _next_id(self) -> str:
         """Generate next job ID."""
-        self._seq += 1
-        return f"job-{self._seq}"
+        return f"job-{next(self._ids)}"
+
+    def _push(self, job: MockJob) -> None:
+        """Queue a pending job by its availability time."""
+        heapq.heappush(self._heap, (job.available_at, next(self._push_seq), job))
 
     def handler(self, name: str) -> Callable:
         """
@@ -350,19 +452,23 @@ class MockJobQueue:
         Returns:
             The created MockJob
         """
-        available_at = datetime.now(UTC) + timedelta(seconds=delay_seconds)
+        now = datetime.now(UTC)
         job = MockJob(
             id=self._next_id(),
             name=name,
             payload=dict(payload),
-            available_at=available_at,
+            created_at=now,
+            available_at=now + timedelta(seconds=delay_seconds) if delay_seconds else now,
             max_attempts=max_attempts,
         )
-        self._jobs.append(job)
-
         if self.sync_mode and delay_seconds == 0:
-            self._process_job(job)
+            handler = self._handlers.get(name)
+            if handler is not None:
+                self._run_job(job, handler)
+                if job.status != "pending":
+                    return job
 
+        self._push(job)
         return job
 
     def _process_job(self, job: MockJob) -> bool:
@@ -378,7 +484,15 @@ class MockJobQueue:
             job.error = f"No handler registered for job type: {job.name}"
             self._failed.append(job)
             return False
+        return self._run_job(job, handler)
+
+    def _run_job(self, job: MockJob, handler: Callable[[dict[str, Any]], Any]) -> bool:
+        """
+        Run a job with an already-resolved handler.
 
+        Returns:
+            True if job succeeded, False if failed
+        """
         job.attempts += 1
         job.status = "processing"
 
@@ -407,14 +521,14 @@ class MockJobQueue:
         Returns:
             The processed job, or None if no jobs available
         """
-        now = datetime.now(UTC)
-        for job in self._jobs:
-            if job.status == "pending" and job.available_at <= now:
-                self._process_job(job)
-                if job.status in ("completed", "failed"):
-                    self._jobs.remove(job)
-                return job
-        return None
+        if not self._heap or self._heap[0][0] > datetime.now(UTC):
+            return None
+        _, _, job = heapq.heappop(self._heap)
+        self._process_job(job)
+        if job.status == "pending":
+            # Failed with retries left; requeue at its backoff time
+            self._push(job)
+        return job
 
     def process_all(self) -> int:
         """
@@ -430,8 +544,8 @@ class MockJobQueue:
 
     @property
     def jobs(self) -> list[MockJob]:
-        """Get all pending jobs."""
-        return [j for j in self._jobs if j.status == "pending"]
+        """Get all pending jobs, in the order they become available."""
+        return [entry[-1] for entry in sorted(self._heap)]
 
     @property
     def completed_jobs(self) -> list[MockJob]:
@@ -445,7 +559,7 @@ class MockJobQueue:
 
     def clear(self) -> None:
         """Clear all jobs (pending, completed, and failed)."""
-        self._jobs.clear()
+        self._heap.clear()
         self._completed.clear()
         self._failed.clear()
 
@@ -459,7 +573,8 @@ class MockJobQueue:
         Returns:
             The job or None if not found
         """
-        for job in self._jobs + self._completed + self._failed:
+        pending = (entry[-1] for entry in self._heap)
+        for job in itertools.chain(pending, self._completed, self._failed):
             if job.id == job_id:
                 return job
         return None
@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import functools
 import importlib.resources as pkg
+import os
+import secrets
+import stat
 import warnings
 from collections.abc import Callable
 from pathlib import Path
@@ -42,10 +45,28 @@ def write(dest: Path, content: str, overwrite: bool = False) -> dict[str, Any]:
     dest.parent.mkdir(parents=True, exist_ok=True)
     if dest.exists() and not overwrite:
         return {"path": str(dest), "action": "skipped", "reason": "exists"}
-    dest.write_text(content, encoding="utf-8")
+    _atomic_write_text(dest, content)
     return {"path": str(dest), "action": "wrote"}
 
 
+def _atomic_write_text(dest: Path, content: str) -> None:
+    """Write via a sibling temp file and os.replace so readers never see a partial file."""
+    tmp = dest.with_name(f".{dest.name}.{secrets.token_hex(4)}.tmp")
+    # os.open applies the umask like write_text would; existing files keep their mode
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        if dest.exists():
+            os.chmod(tmp, stat.S_IMODE(dest.stat().st_mode))
+        with open(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def ensure_init_py(dir_path: Path, overwrite: bool, paired: bool, content: str) -> dict[str, Any]:
     """Create __init__.py; paired=True writes models/schemas re-exports, otherwise minimal."""
     return write(dir_path / "__init__.py", content, overwrite)
@@ -178,11 +199,16 @@ def deprecated_parameter(
         ...         new_param = old_param
         ...     return new_param
     """
+    message = _parameter_message(name, version, reason, removal_version)
+    warnings.warn(message, DeprecatedWarning, stacklevel=stacklevel + 1)
+
+
+@functools.lru_cache(maxsize=256)
+def _parameter_message(name: str, version: str, reason: str, removal_version: str | None) -> str:
+    # Call sites pass literal arguments, so each message is formatted only once
     message = f"Parameter '{name}' is deprecated since version {version}."
 
     if removal_version:
         message += f" It will be removed in version {removal_version}."
 
-    message += f" {reason}"
-
-    warnings.warn(message, DeprecatedWarning, stacklevel=stacklevel + 1)
+    return message + f" {reason}"
@@ -4,11 +4,12 @@ import logging
 from typing import Any, cast
 
 from .add import add_webhooks
-from .encryption import decrypt_secret, encrypt_secret, is_encrypted
+from .encryption import decrypt_secret, encrypt_many, encrypt_secret, is_encrypted
 
 __all__ = [
     "add_webhooks",
     "encrypt_secret",
+    "encrypt_many",
     "decrypt_secret",
     "is_encrypted",
     "trigger_webhook",
@@ -19,6 +19,7 @@ import json
 import logging
 import os
 from collections.abc import Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any, Protocol, TypeGuard, TypeVar, cast
 
@@ -27,7 +28,7 @@ from fastapi import FastAPI
 from svc_infra.db.inbox import InboxStore, InMemoryInboxStore
 from svc_infra.db.outbox import InMemoryOutboxStore, OutboxMessage, OutboxStore
 from svc_infra.jobs.builtins.outbox_processor import make_outbox_tick
-from svc_infra.jobs.builtins.webhook_delivery import make_webhook_handler
+from svc_infra.jobs.builtins.webhook_delivery import WebhookDeliveryHandler, make_webhook_handler
 from svc_infra.jobs.queue import JobQueue
 from svc_infra.jobs.scheduler import InMemoryScheduler
 
@@ -41,6 +42,9 @@ except Exception:  # pragma: no cover - redis is optional in most test runs.
 
 logger = logging.getLogger(__name__)
 
+# Number of outbox messages whose filter fields are read per pipelined round-trip.
+_FETCH_WINDOW = 16
+
 
 T_co = TypeVar("T_co", covariant=True)
 
@@ -94,55 +98,58 @@ class RedisOutboxStore(OutboxStore):
             "attempts": "0",
             "processed_at": "",
         }
-        self._client.hset(self._msg_key(msg_id), mapping=record)
-        self._client.rpush(self._queue_key, msg_id)
+        # The id is needed for the hash key, so only the writes share a round-trip.
+        pipe = self._client.pipeline()
+        pipe.hset(self._msg_key(msg_id), mapping=cast("Mapping[Any, Any]", record))
+        pipe.rpush(self._queue_key, msg_id)
+        pipe.execute()
         return OutboxMessage(id=msg_id, topic=topic, payload=payload, created_at=created_at)
 
     def fetch_next(self, topics: Iterable[str] | None = None) -> OutboxMessage | None:
         allowed = set(topics) if topics else None
         ids = cast("list[Any]", self._client.lrange(self._queue_key, 0, -1))
-        for raw_id in ids:
-            raw_id_str = raw_id.decode() if isinstance(raw_id, (bytes, bytearray)) else str(raw_id)
-            msg_id = int(raw_id_str)
-            msg = cast("dict[Any, Any]", self._client.hgetall(self._msg_key(msg_id)))
-            if not msg:
-                continue
-            topic = msg.get(b"topic")
-            if topic is None:
-                continue
-            topic_str = topic.decode() if isinstance(topic, (bytes, bytearray)) else str(topic)
-            if allowed is not None and topic_str not in allowed:
-                continue
-            attempts = int(msg.get(b"attempts", 0))
-            processed_raw = msg.get(b"processed_at") or b""
-            if processed_raw:
-                continue
-            if attempts > 0:
-                continue
-            payload_raw = msg.get(b"payload") or b"{}"
-            payload_txt = (
-                payload_raw.decode()
-                if isinstance(payload_raw, (bytes, bytearray))
-                else str(payload_raw)
-            )
-            payload = json.loads(payload_txt)
-            created_raw = msg.get(b"created_at") or b""
-            created_at = (
-                datetime.fromisoformat(
-                    created_raw.decode()
-                    if isinstance(created_raw, (bytes, bytearray))
-                    else str(created_raw)
+        for start in range(0, len(ids), _FETCH_WINDOW):
+            window = [
+                int(raw_id.decode() if isinstance(raw_id, (bytes, bytearray)) else str(raw_id))
+                for raw_id in ids[start : start + _FETCH_WINDOW]
+            ]
+            # Read the filter fields for a window of messages in one round-trip so
+            # skipped messages never transfer their payload.
+            pipe = self._client.pipeline()
+            for msg_id in window:
+                pipe.hmget(self._msg_key(msg_id), "topic", "attempts", "processed_at")
+            metas = cast("list[list[Any]]", pipe.execute())
+            for msg_id, (topic, attempts_raw, processed_raw) in zip(window, metas, strict=True):
+                if topic is None:
+                    continue
+                topic_str = topic.decode() if isinstance(topic, (bytes, bytearray)) else str(topic)
+                if allowed is not None and topic_str not in allowed:
+                    continue
+                attempts = int(attempts_raw or 0)
+                if processed_raw:
+                    continue
+                if attempts > 0:
+                    continue
+                payload_raw, created_raw = cast(
+                    "list[Any]", self._client.hmget(self._msg_key(msg_id), "payload", "created_at")
+                )
+                payload = json.loads(payload_raw or b"{}")
+                created_at = (
+                    datetime.fromisoformat(
+                        created_raw.decode()
+                        if isinstance(created_raw, (bytes, bytearray))
+                        else str(created_raw)
+                    )
+                    if created_raw
+                    else datetime.now(UTC)
+                )
+                return OutboxMessage(
+                    id=msg_id,
+                    topic=topic_str,
+                    payload=payload,
+                    created_at=created_at,
+                    attempts=attempts,
                 )
-                if created_raw
-                else datetime.now(UTC)
-            )
-            return OutboxMessage(
-                id=msg_id,
-                topic=topic_str,
-                payload=payload,
-                created_at=created_at,
-                attempts=attempts,
-            )
         return None
 
     def mark_processed(self, msg_id: int) -> None:
@@ -247,6 +254,24 @@ def _subscription_lookup(
     return _get_url, _get_secret
 
 
+def _close_on_shutdown(app: FastAPI, handler: WebhookDeliveryHandler) -> None:
+    """Wrap the app lifespan so the delivery handler's HTTP client is closed on shutdown."""
+    previous_lifespan = getattr(app.router, "lifespan_context", None)
+
+    @asynccontextmanager
+    async def _lifespan(a: FastAPI):
+        try:
+            if previous_lifespan is not None:
+                async with previous_lifespan(a):
+                    yield
+            else:
+                yield
+        finally:
+            await handler.aclose()
+
+    app.router.lifespan_context = _lifespan
+
+
 def add_webhooks(
     app: FastAPI,
     *,
@@ -290,6 +315,8 @@ def add_webhooks(
       ``webhooks_outbox``, ``webhooks_inbox``, ``webhooks_subscriptions``,
       ``webhooks_outbox_tick`` (when a queue is present) and
       ``webhooks_delivery_handler`` (when queue+inbox are present).
+    * When the delivery handler is created, the app lifespan is wrapped so the
+      handler's pooled HTTP client is closed on shutdown.
     """
 
     resolved_outbox = _resolve_value(outbox, lambda: _default_outbox(env))
@@ -320,6 +347,7 @@ def add_webhooks(
             get_secret_for_topic=secret_lookup,
         )
         app.state.webhooks_delivery_handler = handler
+        _close_on_shutdown(app, handler)
     elif scheduler is not None and schedule_tick:
         logger.warning("Scheduler provided without queue; skipping outbox tick registration")
 
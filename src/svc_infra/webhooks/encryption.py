@@ -13,8 +13,10 @@ Generate a key:
 from __future__ import annotations
 
 import base64
+import binascii
 import hashlib
 import os
+from collections.abc import Sequence
 from functools import lru_cache
 from typing import cast
 
@@ -22,6 +24,8 @@ from svc_infra.app.env import require_secret
 
 # Marker prefix for encrypted values
 _ENCRYPTED_PREFIX = "enc:v1:"
+_ENCRYPTED_PREFIX_BYTES = _ENCRYPTED_PREFIX.encode("ascii")
+_ENCRYPTED_PREFIX_LEN = len(_ENCRYPTED_PREFIX)
 
 
 def _get_encryption_key() -> bytes:
@@ -31,12 +35,19 @@ def _get_encryption_key() -> bytes:
         "WEBHOOK_ENCRYPTION_KEY",
         dev_default="dev-only-webhook-encryption-key-not-for-production",
     )
-    # If it's a Fernet key (44 chars base64), use it directly
-    # Otherwise derive a key from it using SHA256
-    if len(key_str) == 44 and key_str.endswith("="):
-        return base64.urlsafe_b64decode(key_str)
-    # Derive a 32-byte key from arbitrary string
-    return hashlib.sha256(key_str.encode()).digest()
+    key_bytes = key_str.encode()
+    # If it's a Fernet key (44 chars base64 of 32 bytes), use it directly.
+    # The length check keeps arbitrary strings off the decode/except path.
+    if len(key_bytes) == 44 and key_bytes.endswith(b"="):
+        try:
+            raw = base64.urlsafe_b64decode(key_bytes)
+        except binascii.Error:
+            pass
+        else:
+            if len(raw) == 32:
+                return raw
+    # Otherwise derive a 32-byte key from the arbitrary string using SHA256
+    return hashlib.sha256(key_bytes).digest()
 
 
 @lru_cache(maxsize=1)
@@ -74,8 +85,30 @@ def encrypt_secret(plaintext: str) -> str:
     if fernet is None:
         return plaintext
 
-    encrypted = fernet.encrypt(plaintext.encode())
-    return _ENCRYPTED_PREFIX + cast("str", encrypted.decode())
+    # Fernet tokens are URL-safe base64, so prefix as bytes and decode once
+    token: bytes = fernet.encrypt(plaintext.encode())
+    return (_ENCRYPTED_PREFIX_BYTES + token).decode("ascii")
+
+
+def encrypt_many(plaintexts: Sequence[str]) -> list[str]:
+    """Encrypt several webhook secrets for storage.
+
+    Equivalent to calling encrypt_secret on each value, but resolves the
+    cipher once for the whole batch (e.g. when loading many subscriptions).
+
+    Args:
+        plaintexts: The secrets to encrypt
+
+    Returns:
+        Encrypted strings in input order, or the originals if encryption unavailable
+    """
+    fernet = _get_fernet()
+    if fernet is None:
+        return list(plaintexts)
+
+    encrypt = fernet.encrypt
+    prefix = _ENCRYPTED_PREFIX_BYTES
+    return [(prefix + encrypt(p.encode())).decode("ascii") for p in plaintexts]
 
 
 def decrypt_secret(ciphertext: str) -> str:
@@ -106,7 +139,7 @@ def decrypt_secret(ciphertext: str) -> str:
         )
         return ciphertext
 
-    encrypted = ciphertext[len(_ENCRYPTED_PREFIX) :].encode()
+    encrypted = ciphertext[_ENCRYPTED_PREFIX_LEN:].encode()
     return cast("str", fernet.decrypt(encrypted).decode())
 
 
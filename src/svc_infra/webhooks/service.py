@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+import secrets
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from uuid import uuid4
 
 from svc_infra.db.outbox import OutboxStore
 from svc_infra.webhooks.encryption import encrypt_secret
 
+# (unix second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_iso_second_cache: tuple[int, str] = (-1, "")
 
-@dataclass
+
+def _utc_now_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string with microseconds.
+
+    The date/time part is formatted at most once per second; publish bursts
+    within the same second only format the microsecond suffix.
+    """
+    global _iso_second_cache
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _iso_second_cache
+    if seconds != cached_second:
+        prefix = datetime.fromtimestamp(seconds, UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        _iso_second_cache = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}+00:00"
+
+
+@dataclass(slots=True)
 class WebhookSubscription:
     """Webhook subscription configuration.
 
@@ -25,27 +44,67 @@ class WebhookSubscription:
     topic: str
     url: str
     secret: str
-    id: str = field(default_factory=lambda: uuid4().hex)
+    id: str = field(default_factory=lambda: secrets.token_hex(16))
+    # (plaintext, ciphertext) of the last encrypted secret
+    _encrypted: tuple[str, str] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def encrypted_secret(self) -> str:
+        """Return the secret encrypted for outbox storage.
+
+        The ciphertext is cached and only recomputed when ``secret`` changes.
+        """
+        cached = self._encrypted
+        if cached is None or cached[0] != self.secret:
+            cached = self._encrypted = (self.secret, encrypt_secret(self.secret))
+        return cached[1]
+
+    def outbox_block(self) -> dict[str, str]:
+        """Return the subscription block stored with each outbox message.
+
+        A new dict is built per call, so a store or processor that mutates one
+        message's payload cannot affect any other message; only the encrypted
+        secret is cached.
+        """
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "url": self.url,
+            # Store only the encrypted secret in the outbox
+            "secret": self.encrypted_secret(),
+        }
 
 
 class InMemoryWebhookSubscriptions:
     def __init__(self):
-        self._subs: dict[str, list[WebhookSubscription]] = {}
+        # Copy-on-write: each topic maps to an immutable tuple that is replaced,
+        # never mutated, so get_for_topic can hand it out without copying.
+        self._subs: dict[str, tuple[WebhookSubscription, ...]] = {}
+        # (topic, url) -> subscription, so upserts find an existing row without a scan
+        self._by_url: dict[tuple[str, str], WebhookSubscription] = {}
 
     def add(self, topic: str, url: str, secret: str) -> None:
         # Upsert semantics per (topic, url): if a subscription already exists
         # for this topic and URL, rotate its secret instead of adding a new row.
         # This mirrors typical real-world secret rotation flows where the
         # endpoint remains the same but the signing secret changes.
-        lst = self._subs.setdefault(topic, [])
-        for sub in lst:
-            if sub.url == url:
-                sub.secret = secret
-                return
-        lst.append(WebhookSubscription(topic, url, secret))
-
-    def get_for_topic(self, topic: str) -> list[WebhookSubscription]:
-        return list(self._subs.get(topic, []))
+        # The secret is encrypted here, once per add or rotation, rather than
+        # on every publish.
+        existing = self._by_url.get((topic, url))
+        if existing is not None:
+            existing.secret = secret
+            existing.encrypted_secret()
+            return
+        sub = WebhookSubscription(topic, url, secret)
+        sub.encrypted_secret()
+        self._by_url[(topic, url)] = sub
+        self._subs[topic] = (*self._subs.get(topic, ()), sub)
+
+    def get_for_topic(self, topic: str) -> tuple[WebhookSubscription, ...]:
+        """Return a snapshot of the topic's subscriptions.
+
+        Later adds do not affect a snapshot that was already returned.
+        """
+        return self._subs.get(topic, ())
 
 
 class WebhookService:
@@ -65,28 +124,21 @@ class WebhookService:
         self._subs = subs
 
     def publish(self, topic: str, payload: dict, *, version: int = 1) -> int:
-        created_at = datetime.now(UTC).isoformat()
+        subs = self._subs.get_for_topic(topic)
+        if not subs:
+            return 0
         base_event = {
             "topic": topic,
             "payload": payload,
             "version": version,
-            "created_at": created_at,
+            "created_at": _utc_now_iso(),
         }
         # For each subscription, enqueue an outbox message with subscriber identity
         last_id = 0
-        for sub in self._subs.get_for_topic(topic):
+        for sub in subs:
+            # Each message gets its own event dict, so mutating one payload in a
+            # store or processor cannot change its siblings
             event = dict(base_event)
-            # Encrypt secret before storing in outbox for security
-            encrypted_secret = encrypt_secret(sub.secret)
-            msg_payload = {
-                "event": event,
-                "subscription": {
-                    "id": sub.id,
-                    "topic": sub.topic,
-                    "url": sub.url,
-                    "secret": encrypted_secret,
-                },
-            }
-            msg = self._outbox.enqueue(topic, msg_payload)
+            msg = self._outbox.enqueue(topic, {"event": event, "subscription": sub.outbox_block()})
             last_id = msg.id
         return last_id
@@ -4,31 +4,110 @@ import hashlib
 import hmac
 import json
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable
+from hashlib import blake2b
 
 logger = logging.getLogger(__name__)
 
+# Reused encoder; json.dumps with non-default options builds a new one per call
+_CANONICAL_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
 
 def canonical_body(payload: dict) -> bytes:
-    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return _CANONICAL_ENCODER.encode(payload).encode()
+
+
+# Bounded LRU of keyed HMAC objects, copied per signature so repeated signing
+# with the same (or a small set of rotating) secrets skips both the UTF-8 encode
+# and the HMAC key schedule. Entries are keyed by a digest of the secret so
+# plaintext secrets are never held as cache keys.
+_HMAC_CACHE_MAXSIZE = 128
+_hmac_cache: OrderedDict[bytes, hmac.HMAC] = OrderedDict()
+_hmac_lock = threading.Lock()
+
+
+def _key_id(secret: str) -> bytes:
+    return blake2b(secret.encode(), digest_size=16).digest()
+
+
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """Return an HMAC-SHA256 object keyed with secret, for copying per signature."""
+    key_id = _key_id(secret)
+    with _hmac_lock:
+        template = _hmac_cache.get(key_id)
+        if template is not None:
+            _hmac_cache.move_to_end(key_id)
+            return template
+
+    template = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+    with _hmac_lock:
+        _hmac_cache[key_id] = template
+        if len(_hmac_cache) > _HMAC_CACHE_MAXSIZE:
+            _hmac_cache.popitem(last=False)
+    return template
+
+
+def _hmac_sha256(secret: str, body: bytes) -> bytes:
+    """HMAC-SHA256 of body, equivalent to hmac.digest(secret.encode(), body, "sha256")."""
+    mac = _hmac_template(secret).copy()
+    mac.update(body)
+    return mac.digest()
 
 
 def sign(secret: str, payload: dict) -> str:
     body = canonical_body(payload)
-    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return _hmac_sha256(secret, body).hex()
 
 
-def verify(secret: str, payload: dict, signature: str) -> bool:
-    expected = sign(secret, payload)
+def sign_body(secret: str, body: bytes) -> str:
+    """Sign an already-canonicalized body; sign(s, p) == sign_body(s, canonical_body(p))."""
+    return _hmac_sha256(secret, body).hex()
+
+
+def sign_many(secrets: Iterable[str], payload: dict) -> list[str]:
+    """Sign one payload with several secrets, serializing the body only once."""
+    body = canonical_body(payload)
+    return [_hmac_sha256(s, body).hex() for s in secrets]
+
+
+_SIGNATURE_HEX_LEN = 2 * hashlib.sha256().digest_size
+
+
+def _parse_signature(signature: str) -> bytes | None:
+    """Decode a hex signature to raw digest bytes, or None if it is malformed.
+
+    Only the exact form sign() emits (64 lowercase hex characters) is accepted;
+    bytes.fromhex alone would also allow uppercase digits and whitespace.
+    """
     try:
-        return hmac.compare_digest(expected, signature)
-    except Exception as e:
+        if len(signature) != _SIGNATURE_HEX_LEN or signature != signature.lower():
+            raise ValueError("signature must be 64 lowercase hex characters")
+        raw = bytes.fromhex(signature)
+        if len(raw) * 2 != _SIGNATURE_HEX_LEN:
+            raise ValueError("signature contains non-hex characters")
+        return raw
+    except (TypeError, ValueError) as e:
         logger.warning("Webhook signature verification failed: %s", e)
+        return None
+
+
+def verify(secret: str, payload: dict, signature: str) -> bool:
+    provided = _parse_signature(signature)
+    if provided is None:
         return False
+    expected = _hmac_sha256(secret, canonical_body(payload))
+    return hmac.compare_digest(expected, provided)
 
 
 def verify_any(secrets: Iterable[str], payload: dict, signature: str) -> bool:
+    provided = _parse_signature(signature)
+    if provided is None:
+        return False
+    body = canonical_body(payload)
     for s in secrets:
-        if verify(s, payload, signature):
+        expected = _hmac_sha256(s, body)
+        if hmac.compare_digest(expected, provided):
             return True
     return False
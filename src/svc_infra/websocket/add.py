@@ -105,13 +105,8 @@ def get_ws_manager(app_or_request: FastAPI | Request) -> ConnectionManager:
             manager = get_ws_manager(websocket.app)
             await manager.connect(user_id, websocket)
     """
-    # Handle both FastAPI app and Request objects
-    if hasattr(app_or_request, "app"):
-        # It's a Request object
-        app = app_or_request.app
-    else:
-        # It's a FastAPI app
-        app = app_or_request
+    # Handle both FastAPI app and Request objects: a Request exposes .app, an app does not
+    app = getattr(app_or_request, "app", app_or_request)
 
     manager = getattr(app.state, _WS_MANAGER_ATTR, None)
     if manager is None:
@@ -17,6 +17,9 @@ Environment Variables (WS_ prefix):
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -52,6 +55,22 @@ class WebSocketConfig(BaseSettings):
     reconnect_jitter: float = Field(default=0.1, description="Jitter factor (0-1)")
 
 
-def get_default_config() -> WebSocketConfig:
-    """Load WebSocket config from environment with defaults."""
+def _ws_environ() -> tuple[tuple[str, str], ...]:
+    # env_prefix matching is case-insensitive, so compare upper-cased names
+    return tuple(sorted((k, v) for k, v in os.environ.items() if k.upper().startswith("WS_")))
+
+
+@lru_cache(maxsize=8)
+def _load_default_config(environ: tuple[tuple[str, str], ...]) -> WebSocketConfig:
+    # environ is only the cache key; WebSocketConfig reads the same variables itself
     return WebSocketConfig()
+
+
+def get_default_config() -> WebSocketConfig:
+    """Load WebSocket config from environment with defaults.
+
+    Parsed settings are cached per set of WS_* environment values, so changed
+    variables are picked up on the next call. Each caller gets its own copy
+    and may modify it without affecting later defaults.
+    """
+    return _load_default_config(_ws_environ()).model_copy()
@@ -26,6 +26,18 @@ class TestOutboxInbox:
         ob.mark_processed(nxt2.id)
         assert ob.fetch_next() is None
 
+    def test_outbox_get_and_unknown_ids(self):
+        ob = InMemoryOutboxStore()
+        m1 = ob.enqueue("orders", {"id": 1})
+
+        assert ob.get(m1.id) is m1
+        assert ob.get(999) is None
+        # Marking an unknown id is a no-op
+        ob.mark_processed(999)
+        ob.mark_failed(999)
+        assert m1.processed_at is None
+        assert m1.attempts == 0
+
     def test_outbox_topic_filter(self):
         ob = InMemoryOutboxStore()
         ob.enqueue("orders", {"id": 1})
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from svc_infra.db.inbox import InMemoryInboxStore
@@ -53,8 +55,8 @@ async def test_webhook_delivery_success(monkeypatch):
         async def __aexit__(self, *a):
             return False
 
-        async def post(self, url, json=None, headers=None):
-            return await fake_post(url, json=json, headers=headers)
+        async def post(self, url, content=None, headers=None):
+            return await fake_post(url, json=json.loads(content), headers=headers)
 
     monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
 
@@ -109,8 +111,8 @@ async def test_webhook_delivery_retry_on_non_2xx(monkeypatch):
         async def __aexit__(self, *a):
             return False
 
-        async def post(self, url, json=None, headers=None):
-            return await fake_post(url, json=json, headers=headers)
+        async def post(self, url, content=None, headers=None):
+            return await fake_post(url, json=json.loads(content), headers=headers)
 
     monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
 
@@ -167,8 +169,8 @@ async def test_webhook_delivery_uses_subscription_envelope(monkeypatch):
         async def __aexit__(self, *a):
             return False
 
-        async def post(self, url, json=None, headers=None):
-            return await fake_post(url, json=json, headers=headers)
+        async def post(self, url, content=None, headers=None):
+            return await fake_post(url, json=json.loads(content), headers=headers)
 
     monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
 
@@ -189,3 +191,89 @@ async def test_webhook_delivery_uses_subscription_envelope(monkeypatch):
     assert headers.get("X-Event-Id") == str(msg.id)
     expected_sig = sign("sekrit", envelope["event"])
     assert headers.get("X-Signature") == expected_sig
+    assert headers.get("Content-Type") == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_webhook_handler_reuses_http_client(monkeypatch):
+    outbox = InMemoryOutboxStore()
+    inbox = InMemoryInboxStore()
+    queue = InMemoryJobQueue()
+    for n in range(2):
+        msg = outbox.enqueue("invoice.created", {"id": f"inv_{n}"})
+        queue.enqueue(
+            "outbox.invoice.created",
+            {"outbox_id": msg.id, "topic": msg.topic, "payload": msg.payload},
+        )
+
+    fake = FakeServer()
+    clients = []
+
+    import httpx
+
+    class DummyClient:
+        def __init__(self, *a, **k):
+            clients.append(self)
+
+        async def post(self, url, content=None, headers=None):
+            return await fake.post(url, json=json.loads(content), headers=headers)
+
+    monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
+
+    handler = make_webhook_handler(
+        outbox=outbox,
+        inbox=inbox,
+        get_webhook_url_for_topic=lambda t: fake.url,
+        get_secret_for_topic=lambda t: "sekrit",
+    )
+    assert await process_one(queue, handler) is True
+    assert await process_one(queue, handler) is True
+
+    assert len(fake.calls) == 2
+    assert len(clients) == 1
+
+
+@pytest.mark.asyncio
+async def test_webhook_handler_aclose_closes_http_client(monkeypatch):
+    outbox = InMemoryOutboxStore()
+    inbox = InMemoryInboxStore()
+    queue = InMemoryJobQueue()
+    msg = outbox.enqueue("invoice.created", {"id": "inv_1"})
+    queue.enqueue(
+        "outbox.invoice.created",
+        {"outbox_id": msg.id, "topic": msg.topic, "payload": msg.payload},
+    )
+
+    fake = FakeServer()
+    clients = []
+
+    import httpx
+
+    class DummyClient:
+        def __init__(self, *a, **k):
+            self.closed = False
+            clients.append(self)
+
+        async def post(self, url, content=None, headers=None):
+            return await fake.post(url, json=json.loads(content), headers=headers)
+
+        async def aclose(self):
+            self.closed = True
+
+    monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
+
+    handler = make_webhook_handler(
+        outbox=outbox,
+        inbox=inbox,
+        get_webhook_url_for_topic=lambda t: fake.url,
+        get_secret_for_topic=lambda t: "sekrit",
+    )
+    # Closing before any delivery is a no-op
+    await handler.aclose()
+    assert clients == []
+
+    assert await process_one(queue, handler) is True
+    await handler.aclose()
+
+    assert len(clients) == 1
+    assert clients[0].closed is True
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import UTC, datetime
 
 import pytest
 
@@ -43,6 +44,19 @@ async def test_fail_and_backoff_requeues_job():
     assert nxt is None
 
 
+def test_fail_spreads_retry_over_upper_half_of_backoff():
+    q = InMemoryJobQueue()
+    job = q.enqueue("task", {})
+    job.backoff_seconds = 10
+    q.reserve_next()
+
+    before = datetime.now(UTC)
+    q.fail(job.id, error="boom")
+
+    delay = (job.available_at - before).total_seconds()
+    assert 5 <= delay <= 10.5
+
+
 @pytest.mark.asyncio
 async def test_delayed_enqueue_and_reserve():
     q = InMemoryJobQueue()
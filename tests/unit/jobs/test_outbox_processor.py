@@ -29,3 +29,19 @@ async def test_outbox_tick_enqueues_job():
     assert j2 is not None
     assert j2.name == "outbox.customer.created"
     assert j2.payload["outbox_id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_outbox_tick_moves_up_to_batch_size():
+    outbox = InMemoryOutboxStore()
+    queue = InMemoryJobQueue()
+    for n in range(5):
+        outbox.enqueue("invoice.created", {"id": f"inv_{n}"})
+    tick = make_outbox_tick(outbox, queue, batch_size=3)
+
+    await tick()
+    assert [j.payload["outbox_id"] for j in queue._jobs] == [1, 2, 3]
+
+    # Second tick drains the remainder and stops when the outbox is empty
+    await tick()
+    assert [j.payload["outbox_id"] for j in queue._jobs] == [1, 2, 3, 4, 5]
@@ -16,26 +16,26 @@ from svc_infra.api.fastapi.routers import (
 )
 from svc_infra.app.env import DEV_ENV, LOCAL_ENV, PROD_ENV, Environment
 
+# Resolved once at import; every valid-package assertion reuses it
+_JSON_MOD = _validate_base_package("json")
+
 
 class TestShouldSkipModule:
     """Tests for _should_skip_module function."""
 
-    def test_skips_private_module(self) -> None:
-        """Skips modules starting with underscore."""
-        assert _should_skip_module("package._private") is True
-
-    def test_skips_dunder_module(self) -> None:
-        """Skips dunder modules."""
-        assert _should_skip_module("package.__init__") is True
-
-    def test_allows_public_module(self) -> None:
-        """Allows public modules."""
-        assert _should_skip_module("package.public") is False
-
-    def test_checks_last_segment(self) -> None:
-        """Only checks the last segment."""
-        assert _should_skip_module("_private.public.router") is False
-        assert _should_skip_module("public.module._private") is True
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("package._private", True),
+            ("package.__init__", True),
+            ("package.public", False),
+            ("_private.public.router", False),
+            ("public.module._private", True),
+        ],
+    )
+    def test_should_skip(self, name: str, expected: bool) -> None:
+        """Only the last segment decides: private and dunder modules are skipped."""
+        assert _should_skip_module(name) is expected
 
 
 class TestDeriveDocsFromModule:
@@ -102,14 +102,14 @@ class TestValidateBasePackage:
 
     def test_valid_package(self) -> None:
         """Validates a valid package."""
-        # Use a known package
-        module = _validate_base_package("json")
-        assert module is not None
+        assert _JSON_MOD is not None
+        assert _JSON_MOD.__name__ == "json"
 
     def test_invalid_package_raises(self) -> None:
         """Invalid package raises RuntimeError."""
-        with pytest.raises(RuntimeError, match="Could not import"):
+        with pytest.raises(RuntimeError) as exc:
             _validate_base_package("nonexistent_package_xyz")
+        assert "Could not import" in str(exc.value)
 
 
 class TestNormalizeEnvironment:
@@ -134,27 +134,23 @@ class TestNormalizeEnvironment:
 class TestShouldForceIncludeInSchema:
     """Tests for _should_force_include_in_schema function."""
 
-    def test_local_env_forces_include(self) -> None:
-        """Local environment forces include."""
-        result = _should_force_include_in_schema(LOCAL_ENV, None)
-        assert result is True
-
-    def test_dev_env_forces_include(self) -> None:
-        """Dev environment forces include."""
-        result = _should_force_include_in_schema(DEV_ENV, None)
-        assert result is True
-
-    def test_prod_env_does_not_force(self) -> None:
-        """Production environment does not force include."""
-        result = _should_force_include_in_schema(PROD_ENV, None)
-        assert result is False
-
-    def test_explicit_true_overrides(self) -> None:
-        """Explicit True overrides environment."""
-        result = _should_force_include_in_schema(PROD_ENV, True)
-        assert result is True
-
-    def test_explicit_false_overrides(self) -> None:
-        """Explicit False overrides environment."""
-        result = _should_force_include_in_schema(LOCAL_ENV, False)
-        assert result is False
+    @pytest.mark.parametrize(
+        ("env", "override", "expected"),
+        [
+            (LOCAL_ENV, None, True),
+            (DEV_ENV, None, True),
+            (PROD_ENV, None, False),
+            (PROD_ENV, True, True),
+            (LOCAL_ENV, False, False),
+        ],
+        ids=[
+            "local_forces_include",
+            "dev_forces_include",
+            "prod_does_not_force",
+            "explicit_true_overrides",
+            "explicit_false_overrides",
+        ],
+    )
+    def test_force_include(self, env: Environment, override: bool | None, expected: bool) -> None:
+        """Explicit override wins; otherwise non-prod environments force include."""
+        assert _should_force_include_in_schema(env, override) is expected
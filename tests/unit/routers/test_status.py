@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-from unittest.mock import patch
-
 import pytest
-from starlette.testclient import TestClient
+import pytest_asyncio
 
 from svc_infra.api.fastapi.routers.status import (
     ROUTER_EXCLUDED_ENVIRONMENTS,
@@ -14,6 +12,22 @@ from svc_infra.api.fastapi.routers.status import (
 )
 from svc_infra.app.env import PROD_ENV
 
+# CI/CD env vars consulted by _get_commit, in priority order
+CI_VARS = (
+    "GIT_COMMIT",
+    "RAILWAY_GIT_COMMIT_SHA",
+    "VERCEL_GIT_COMMIT_SHA",
+    "RENDER_GIT_COMMIT",
+    "HEROKU_SLUG_COMMIT",
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_ci(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Start every test without any CI/CD commit env vars set."""
+    for var in CI_VARS:
+        monkeypatch.delenv(var, raising=False)
+
 
 class TestStatusRouterConfig:
     """Verify module-level configuration constants."""
@@ -25,114 +39,118 @@ class TestStatusRouterConfig:
 class TestFormatUptime:
     """Tests for _format_uptime helper."""
 
-    def test_seconds_only(self) -> None:
-        assert _format_uptime(45) == "45s"
-
-    def test_minutes_and_seconds(self) -> None:
-        assert _format_uptime(125) == "2m 5s"
-
-    def test_hours_minutes_seconds(self) -> None:
-        assert _format_uptime(3661) == "1h 1m 1s"
-
-    def test_days(self) -> None:
-        assert _format_uptime(90061) == "1d 1h 1m 1s"
-
-    def test_zero(self) -> None:
-        assert _format_uptime(0) == "0s"
+    @pytest.mark.parametrize(
+        ("seconds", "expected"),
+        [
+            (0, "0s"),
+            (45, "45s"),
+            (125, "2m 5s"),
+            (3661, "1h 1m 1s"),
+            (90061, "1d 1h 1m 1s"),
+        ],
+    )
+    def test_format_uptime(self, seconds: int, expected: str) -> None:
+        assert _format_uptime(seconds) == expected
 
 
 class TestGetCommit:
     """Tests for _get_commit CI/CD env var detection."""
 
-    def test_returns_none_locally(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    def test_returns_none_locally(self) -> None:
         """No commit shown when no CI/CD env vars are set."""
-        for var in (
-            "GIT_COMMIT",
-            "RAILWAY_GIT_COMMIT_SHA",
-            "VERCEL_GIT_COMMIT_SHA",
-            "RENDER_GIT_COMMIT",
-            "HEROKU_SLUG_COMMIT",
-        ):
-            monkeypatch.delenv(var, raising=False)
         assert _get_commit() is None
 
-    def test_reads_git_commit(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("GIT_COMMIT", "abc123def456789")
-        assert _get_commit() == "abc123def456"
+    @pytest.mark.parametrize(
+        ("var", "value", "expected"),
+        [
+            ("GIT_COMMIT", "abc123def456789", "abc123def456"),
+            ("RAILWAY_GIT_COMMIT_SHA", "deadbeef12345678", "deadbeef1234"),
+            ("GIT_COMMIT", "a" * 40, "a" * 12),
+        ],
+        ids=["git_commit", "railway_sha", "truncates_to_12_chars"],
+    )
+    def test_reads_commit(
+        self, monkeypatch: pytest.MonkeyPatch, var: str, value: str, expected: str
+    ) -> None:
+        monkeypatch.setenv(var, value)
+        assert _get_commit() == expected
+
+
+@pytest.fixture(scope="module")
+def status_app():
+    """Minimal app with the status router mounted."""
+    from fastapi import FastAPI
+
+    from svc_infra.api.fastapi.routers.status import router
 
-    def test_reads_railway_sha(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.delenv("GIT_COMMIT", raising=False)
-        monkeypatch.setenv("RAILWAY_GIT_COMMIT_SHA", "deadbeef12345678")
-        assert _get_commit() == "deadbeef1234"
+    app = FastAPI(title="test-svc", version="1.2.3")
+    app.include_router(router)
+    return app
 
-    def test_truncates_to_12_chars(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("GIT_COMMIT", "a" * 40)
-        assert _get_commit() == "a" * 12
 
+@pytest_asyncio.fixture
+async def status_client(status_app):
+    """In-process ASGI client for ``status_app``.
 
+    ``httpx.ASGITransport`` neither uses TestClient's thread portal nor runs
+    the lifespan protocol, so no startup/shutdown work happens per test; the
+    status router registers no lifespan hooks that would need it.
+    """
+    import httpx
+
+    transport = httpx.ASGITransport(app=status_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        yield c
+
+
+@pytest.mark.integration
 class TestStatusEndpoint:
-    """Integration tests for the /status route via TestClient."""
+    """Integration tests for the /status route via an ASGI client.
+
+    Deselect with ``-m "not integration"`` when iterating on the pure helpers.
+    """
 
     _PATCH_ROOT = "svc_infra.api.fastapi.setup.get_root_app"
 
-    def _make_app(self):
-        """Create a minimal app with the status router."""
-        from fastapi import FastAPI
-
-        from svc_infra.api.fastapi.routers.status import router
-
-        app = FastAPI(title="test-svc", version="1.2.3")
-        app.include_router(router)
-        return app
-
-    def test_returns_200(self) -> None:
-        app = self._make_app()
-        with patch(self._PATCH_ROOT, return_value=app):
-            with TestClient(app) as c:
-                r = c.get("/status")
-                assert r.status_code == 200
-
-    def test_response_has_required_fields(self) -> None:
-        app = self._make_app()
-        with patch(self._PATCH_ROOT, return_value=app):
-            with TestClient(app) as c:
-                data = c.get("/status").json()
-                assert data["status"] == "ok"
-                assert data["service"] == "test-svc"
-                assert data["version"] == "1.2.3"
-                assert "env" in data
-                assert "python" in data
-                assert "uptime" in data
-                assert "started_at" in data
-                assert "timestamp" in data
-
-    def test_includes_commit_when_ci_env_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    @pytest.fixture(autouse=True)
+    def root_app(self, monkeypatch: pytest.MonkeyPatch, status_app) -> None:
+        monkeypatch.setattr(self._PATCH_ROOT, lambda: status_app)
+
+    @pytest.mark.asyncio
+    async def test_returns_200(self, status_client) -> None:
+        r = await status_client.get("/status")
+        assert r.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_response_has_required_fields(self, status_client) -> None:
+        data = (await status_client.get("/status")).json()
+        assert data["status"] == "ok"
+        assert data["service"] == "test-svc"
+        assert data["version"] == "1.2.3"
+        assert "env" in data
+        assert "python" in data
+        assert "uptime" in data
+        assert "started_at" in data
+        assert "timestamp" in data
+
+    @pytest.mark.asyncio
+    async def test_includes_commit_when_ci_env_set(
+        self, monkeypatch: pytest.MonkeyPatch, status_client
+    ) -> None:
         monkeypatch.setenv("RAILWAY_GIT_COMMIT_SHA", "abc123456789abcdef")
-        app = self._make_app()
-        with patch(self._PATCH_ROOT, return_value=app):
-            with TestClient(app) as c:
-                data = c.get("/status").json()
-                assert data["commit"] == "abc123456789"
-
-    def test_no_commit_field_locally(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        for var in (
-            "GIT_COMMIT",
-            "RAILWAY_GIT_COMMIT_SHA",
-            "VERCEL_GIT_COMMIT_SHA",
-            "RENDER_GIT_COMMIT",
-            "HEROKU_SLUG_COMMIT",
-        ):
-            monkeypatch.delenv(var, raising=False)
-        app = self._make_app()
-        with patch(self._PATCH_ROOT, return_value=app):
-            with TestClient(app) as c:
-                data = c.get("/status").json()
-                assert "commit" not in data
-
-    def test_fallback_when_no_root_app(self) -> None:
-        app = self._make_app()
-        with patch(self._PATCH_ROOT, return_value=None):
-            with TestClient(app) as c:
-                data = c.get("/status").json()
-                assert data["service"] == "unknown"
-                assert data["version"] == "unknown"
+        data = (await status_client.get("/status")).json()
+        assert data["commit"] == "abc123456789"
+
+    @pytest.mark.asyncio
+    async def test_no_commit_field_locally(self, status_client) -> None:
+        data = (await status_client.get("/status")).json()
+        assert "commit" not in data
+
+    @pytest.mark.asyncio
+    async def test_fallback_when_no_root_app(
+        self, monkeypatch: pytest.MonkeyPatch, status_client
+    ) -> None:
+        monkeypatch.setattr(self._PATCH_ROOT, lambda: None)
+        data = (await status_client.get("/status")).json()
+        assert data["service"] == "unknown"
+        assert data["version"] == "unknown"
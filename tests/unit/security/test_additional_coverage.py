@@ -9,15 +9,19 @@ Targets:
 from __future__ import annotations
 
 import uuid
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
+from types import MappingProxyType
 from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
+import pytest_asyncio
 
 from svc_infra.security.headers import SECURE_DEFAULTS, SecurityHeadersMiddleware
 from svc_infra.security.models import (
     AuthSession,
+    RefreshToken,
 )
 from svc_infra.security.session import (
     DEFAULT_REFRESH_TTL_MINUTES,
@@ -29,118 +33,125 @@ from svc_infra.security.session import (
 
 
 class TestSecureDefaults:
-    def test_defaults_contains_hsts(self) -> None:
-        assert "Strict-Transport-Security" in SECURE_DEFAULTS
-        assert "max-age=" in SECURE_DEFAULTS["Strict-Transport-Security"]
+    def test_defaults_are_read_only(self) -> None:
+        assert isinstance(SECURE_DEFAULTS, MappingProxyType)
+        with pytest.raises(TypeError):
+            SECURE_DEFAULTS["X-Frame-Options"] = "SAMEORIGIN"  # type: ignore[index]
 
-    def test_defaults_contains_csp(self) -> None:
-        assert "Content-Security-Policy" in SECURE_DEFAULTS
-        assert "default-src" in SECURE_DEFAULTS["Content-Security-Policy"]
+    @pytest.mark.parametrize(
+        ("header", "predicate"),
+        [
+            ("Strict-Transport-Security", lambda v: "max-age=" in v),
+            ("Content-Security-Policy", lambda v: "default-src" in v),
+            ("X-Frame-Options", lambda v: v == "DENY"),
+            ("X-Content-Type-Options", lambda v: v == "nosniff"),
+        ],
+        ids=["hsts", "csp", "xfo", "xcto"],
+    )
+    def test_default_contains(self, header: str, predicate: Any) -> None:
+        assert header in SECURE_DEFAULTS
+        assert predicate(SECURE_DEFAULTS[header])
 
-    def test_defaults_contains_xfo(self) -> None:
-        assert "X-Frame-Options" in SECURE_DEFAULTS
-        assert SECURE_DEFAULTS["X-Frame-Options"] == "DENY"
 
-    def test_defaults_contains_xcto(self) -> None:
-        assert "X-Content-Type-Options" in SECURE_DEFAULTS
-        assert SECURE_DEFAULTS["X-Content-Type-Options"] == "nosniff"
+async def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
 
 
-class TestSecurityHeadersMiddleware:
-    @pytest.mark.asyncio
-    async def test_non_http_scope_passthrough(self) -> None:
-        app = AsyncMock()
-        middleware = SecurityHeadersMiddleware(app)
-        scope = {"type": "websocket"}
-        receive = AsyncMock()
-        send = AsyncMock()
+async def _replay_app(scope: dict, receive: Any, send: Any) -> None:
+    """Minimal ASGI app that sends the messages stashed in ``scope["messages"]``."""
+    for message in scope["messages"]:
+        await send(message)
 
-        await middleware(scope, receive, send)
-        app.assert_awaited_once_with(scope, receive, send)
 
-    @pytest.mark.asyncio
-    async def test_http_scope_adds_headers(self) -> None:
-        messages_sent: list[dict] = []
-
-        async def fake_app(scope: dict, receive: Any, send: Any) -> None:
-            await send({"type": "http.response.start", "headers": []})
-            await send({"type": "http.response.body", "body": b"ok"})
-
-        async def capture_send(message: dict) -> None:
-            messages_sent.append(message)
+def _decode_headers(message: dict) -> dict[str, str]:
+    return {k.decode(): v.decode() for k, v in message["headers"]}
 
-        middleware = SecurityHeadersMiddleware(fake_app)
-        scope = {"type": "http"}
 
-        await middleware(scope, AsyncMock(), capture_send)
-
-        assert len(messages_sent) == 2
-        start_msg = messages_sent[0]
-        assert start_msg["type"] == "http.response.start"
-        headers = {k.decode(): v.decode() for k, v in start_msg["headers"]}
-        assert "X-Frame-Options" in headers
-        assert headers["X-Frame-Options"] == "DENY"
-
-    @pytest.mark.asyncio
-    async def test_http_scope_with_overrides(self) -> None:
-        messages_sent: list[dict] = []
+class TestSecurityHeadersMiddleware:
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def middleware() -> SecurityHeadersMiddleware:
+        return SecurityHeadersMiddleware(_replay_app)
 
-        async def fake_app(scope: dict, receive: Any, send: Any) -> None:
-            await send({"type": "http.response.start", "headers": []})
+    @pytest.fixture
+    def run_http(self) -> Callable[..., Awaitable[list[dict]]]:
+        """Run a middleware over an HTTP scope replaying ``messages``; return what was sent."""
 
-        async def capture_send(message: dict) -> None:
-            messages_sent.append(message)
+        async def run(middleware: SecurityHeadersMiddleware, messages: list[dict]) -> list[dict]:
+            messages_sent: list[dict] = []
 
-        overrides = {"X-Custom-Header": "custom-value", "X-Frame-Options": "SAMEORIGIN"}
-        middleware = SecurityHeadersMiddleware(fake_app, overrides=overrides)
-        scope = {"type": "http"}
+            async def capture_send(message: dict) -> None:
+                messages_sent.append(message)
 
-        await middleware(scope, AsyncMock(), capture_send)
+            await middleware({"type": "http", "messages": messages}, _noop, capture_send)
+            return messages_sent
 
-        start_msg = messages_sent[0]
-        headers = {k.decode(): v.decode() for k, v in start_msg["headers"]}
-        assert headers["X-Custom-Header"] == "custom-value"
-        assert headers["X-Frame-Options"] == "SAMEORIGIN"  # Override takes precedence
+        return run
 
     @pytest.mark.asyncio
-    async def test_http_scope_preserves_existing_headers(self) -> None:
-        messages_sent: list[dict] = []
-
-        async def fake_app(scope: dict, receive: Any, send: Any) -> None:
-            await send(
-                {
-                    "type": "http.response.start",
-                    "headers": [(b"Content-Type", b"text/html")],
-                }
-            )
-
-        async def capture_send(message: dict) -> None:
-            messages_sent.append(message)
-
-        middleware = SecurityHeadersMiddleware(fake_app)
-        scope = {"type": "http"}
+    async def test_non_http_scope_passthrough(self) -> None:
+        app = AsyncMock()
+        middleware = SecurityHeadersMiddleware(app)
+        scope = {"type": "websocket"}
 
-        await middleware(scope, AsyncMock(), capture_send)
+        await middleware(scope, _noop, _noop)
+        app.assert_awaited_once_with(scope, _noop, _noop)
+
+    @pytest.mark.parametrize(
+        ("initial_headers", "overrides", "expected_pairs"),
+        [
+            ([], None, {"X-Frame-Options": "DENY"}),
+            (
+                [],
+                {"X-Custom-Header": "custom-value", "X-Frame-Options": "SAMEORIGIN"},
+                # Override takes precedence over the secure default
+                {"X-Custom-Header": "custom-value", "X-Frame-Options": "SAMEORIGIN"},
+            ),
+            (
+                [(b"Content-Type", b"text/html")],
+                None,
+                # Existing headers are kept alongside the security headers
+                {"Content-Type": "text/html", "X-Frame-Options": "DENY"},
+            ),
+        ],
+        ids=["adds_defaults", "overrides", "preserves_existing"],
+    )
+    @pytest.mark.asyncio
+    async def test_http_scope_headers(
+        self,
+        middleware: SecurityHeadersMiddleware,
+        run_http: Callable[..., Awaitable[list[dict]]],
+        initial_headers: list[tuple[bytes, bytes]],
+        overrides: dict[str, str] | None,
+        expected_pairs: dict[str, str],
+    ) -> None:
+        if overrides is not None:
+            middleware = SecurityHeadersMiddleware(_replay_app, overrides=overrides)
+
+        messages_sent = await run_http(
+            middleware,
+            [
+                {"type": "http.response.start", "headers": list(initial_headers)},
+                {"type": "http.response.body", "body": b"ok"},
+            ],
+        )
 
+        assert len(messages_sent) == 2
         start_msg = messages_sent[0]
-        headers = {k.decode(): v.decode() for k, v in start_msg["headers"]}
-        assert headers["Content-Type"] == "text/html"
-        assert "X-Frame-Options" in headers  # Also added security headers
+        assert start_msg["type"] == "http.response.start"
+        headers = _decode_headers(start_msg)
+        for name, value in expected_pairs.items():
+            assert headers[name] == value
 
     @pytest.mark.asyncio
-    async def test_non_start_message_passthrough(self) -> None:
-        messages_sent: list[dict] = []
-
-        async def fake_app(scope: dict, receive: Any, send: Any) -> None:
-            await send({"type": "http.response.body", "body": b"test"})
-
-        async def capture_send(message: dict) -> None:
-            messages_sent.append(message)
-
-        middleware = SecurityHeadersMiddleware(fake_app)
-        scope = {"type": "http"}
-
-        await middleware(scope, AsyncMock(), capture_send)
+    async def test_non_start_message_passthrough(
+        self,
+        middleware: SecurityHeadersMiddleware,
+        run_http: Callable[..., Awaitable[list[dict]]],
+    ) -> None:
+        messages_sent = await run_http(
+            middleware, [{"type": "http.response.body", "body": b"test"}]
+        )
 
         assert len(messages_sent) == 1
         assert messages_sent[0]["type"] == "http.response.body"
@@ -150,6 +161,8 @@ class TestSecurityHeadersMiddleware:
 
 
 class FakeDB:
+    __slots__ = ("added",)
+
     def __init__(self) -> None:
         self.added: list[Any] = []
 
@@ -169,13 +182,26 @@ class FakeDB:
         return Result()
 
 
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture
+def db() -> FakeDB:
+    return FakeDB()
+
+
+@pytest_asyncio.fixture
+async def issued_rt(db: FakeDB) -> RefreshToken:
+    _raw, rt = await issue_session_and_refresh(db, user_id=USER_ID)
+    return rt
+
+
 class TestIssueSessionAndRefresh:
     @pytest.mark.asyncio
-    async def test_issue_with_all_optional_params(self) -> None:
-        db = FakeDB()
+    async def test_issue_with_all_optional_params(self, db: FakeDB) -> None:
         raw, rt = await issue_session_and_refresh(
             db,
-            user_id=uuid.uuid4(),
+            user_id=USER_ID,
             tenant_id="tenant-123",
             user_agent="Mozilla/5.0",
             ip_hash="abc123hash",
@@ -190,59 +216,50 @@ class TestIssueSessionAndRefresh:
         assert session.ip_hash == "abc123hash"
 
     @pytest.mark.asyncio
-    async def test_issue_with_default_ttl(self) -> None:
-        db = FakeDB()
-        _raw, rt = await issue_session_and_refresh(db, user_id=uuid.uuid4())
+    async def test_issue_with_default_ttl(self, issued_rt: RefreshToken) -> None:
         # Token should expire in about DEFAULT_REFRESH_TTL_MINUTES
         expected_expiry = datetime.now(UTC) + timedelta(minutes=DEFAULT_REFRESH_TTL_MINUTES)
-        assert rt.expires_at is not None
+        assert issued_rt.expires_at is not None
         # Allow 1 minute tolerance
-        assert abs((rt.expires_at - expected_expiry).total_seconds()) < 60
+        assert abs((issued_rt.expires_at - expected_expiry).total_seconds()) < 60
 
 
 class TestRotateSessionRefresh:
     @pytest.mark.asyncio
-    async def test_rotate_already_revoked_raises(self) -> None:
-        db = FakeDB()
-        _raw, rt = await issue_session_and_refresh(db, user_id=uuid.uuid4())
+    async def test_rotate_already_revoked_raises(self, db: FakeDB, issued_rt: RefreshToken) -> None:
         # Manually mark as revoked
-        rt.revoked_at = datetime.now(UTC)
+        issued_rt.revoked_at = datetime.now(UTC)
 
-        with pytest.raises(ValueError, match="already revoked"):
-            await rotate_session_refresh(db, current=rt)
+        with pytest.raises(ValueError) as exc:
+            await rotate_session_refresh(db, current=issued_rt)
+        assert "already revoked" in str(exc.value)
 
     @pytest.mark.asyncio
-    async def test_rotate_expired_raises(self) -> None:
-        db = FakeDB()
-        _raw, rt = await issue_session_and_refresh(db, user_id=uuid.uuid4())
+    async def test_rotate_expired_raises(self, db: FakeDB, issued_rt: RefreshToken) -> None:
         # Set expires_at to past
-        rt.expires_at = datetime.now(UTC) - timedelta(hours=1)
+        issued_rt.expires_at = datetime.now(UTC) - timedelta(hours=1)
 
-        with pytest.raises(ValueError, match="expired"):
-            await rotate_session_refresh(db, current=rt)
+        with pytest.raises(ValueError) as exc:
+            await rotate_session_refresh(db, current=issued_rt)
+        assert "expired" in str(exc.value)
 
     @pytest.mark.asyncio
-    async def test_rotate_with_custom_ttl(self) -> None:
-        db = FakeDB()
-        _raw, rt = await issue_session_and_refresh(db, user_id=uuid.uuid4())
-
-        _new_raw, new_rt = await rotate_session_refresh(db, current=rt, ttl_minutes=60)
+    async def test_rotate_with_custom_ttl(self, db: FakeDB, issued_rt: RefreshToken) -> None:
+        _new_raw, new_rt = await rotate_session_refresh(db, current=issued_rt, ttl_minutes=60)
 
         expected_expiry = datetime.now(UTC) + timedelta(minutes=60)
         assert new_rt.expires_at is not None
         assert abs((new_rt.expires_at - expected_expiry).total_seconds()) < 60
 
     @pytest.mark.asyncio
-    async def test_rotate_with_none_expires_at(self) -> None:
-        db = FakeDB()
-        _raw, rt = await issue_session_and_refresh(db, user_id=uuid.uuid4())
+    async def test_rotate_with_none_expires_at(self, db: FakeDB, issued_rt: RefreshToken) -> None:
         # Set expires_at to None (edge case)
-        rt.expires_at = None
+        issued_rt.expires_at = None
 
         # Should work - token without expiry can still be rotated
-        new_raw, _new_rt = await rotate_session_refresh(db, current=rt)
+        new_raw, _new_rt = await rotate_session_refresh(db, current=issued_rt)
 
         assert new_raw is not None
-        assert rt.revoked_at is not None
+        assert issued_rt.revoked_at is not None
         # expires_at should be set to revoked_at
-        assert rt.expires_at == rt.revoked_at
+        assert issued_rt.expires_at == issued_rt.revoked_at
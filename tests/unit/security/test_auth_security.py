@@ -9,17 +9,25 @@ Coverage targets:
 
 from __future__ import annotations
 
-import hashlib
+import itertools
 import time
 import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi import HTTPException
 from fastapi_users.authentication.strategy.jwt import JWTStrategy
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from svc_infra.security import hibp as hibp_module
+from svc_infra.security import permissions as permissions_module
 from svc_infra.security.hibp import CacheEntry, HIBPClient, sha1_hex
 from svc_infra.security.jwt_rotation import RotatingJWTStrategy
 from svc_infra.security.lockout import (
@@ -41,14 +49,25 @@ from svc_infra.security.permissions import (
     register_role,
 )
 
+# Tests only need ids that differ from each other, not fresh entropy per call
+_UID_POOL = itertools.cycle([uuid.uuid4() for _ in range(64)])
+
+
+def _uid() -> uuid.UUID:
+    return next(_UID_POOL)
+
+
 # ============== HIBP Tests ==============
 
+# Digests for the fixed test passwords; only TestSha1Hex recomputes sha1_hex
+_SHA1_CACHE: dict[str, str] = {
+    p: sha1_hex(p) for p in ("password123", "test", "test_password", "unique_password_abc123")
+}
+
 
 class TestSha1Hex:
     def test_sha1_hex_basic(self) -> None:
-        result = sha1_hex("password")
-        expected = hashlib.sha1(b"password").hexdigest().upper()
-        assert result == expected
+        assert sha1_hex("password") == "5BAA61E4C9B93F3F0682250B6CF8331B7EE68FD8"
 
     def test_sha1_hex_unicode(self) -> None:
         result = sha1_hex("paSSw0rd!")
@@ -63,12 +82,33 @@ class TestCacheEntry:
         assert entry.expires_at > time.time()
 
 
+_NOW = time.time()
+
+
+@pytest.fixture
+def freeze_hibp_clock(monkeypatch: pytest.MonkeyPatch) -> Callable[[float], None]:
+    """Pin the clock seen by ``svc_infra.security.hibp`` to a fixed timestamp."""
+
+    def freeze(now: float) -> None:
+        monkeypatch.setattr(hibp_module, "time", SimpleNamespace(time=lambda: now))
+
+    return freeze
+
+
 class TestHIBPClient:
-    def test_init_defaults(self) -> None:
-        client = HIBPClient()
-        assert client.base_url == "https://api.pwnedpasswords.com"
-        assert client.ttl_seconds == 3600
-        assert client.timeout == 5.0
+    @pytest.fixture(scope="class")
+    @staticmethod
+    def hibp_client() -> HIBPClient:
+        return HIBPClient()
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self, hibp_client: HIBPClient) -> None:
+        hibp_client._cache.clear()
+
+    def test_init_defaults(self, hibp_client: HIBPClient) -> None:
+        assert hibp_client.base_url == "https://api.pwnedpasswords.com"
+        assert hibp_client.ttl_seconds == 3600
+        assert hibp_client.timeout == 5.0
 
     def test_init_custom(self) -> None:
         client = HIBPClient(
@@ -82,19 +122,22 @@ class TestHIBPClient:
         assert client.timeout == 10.0
         assert client.user_agent == "test-agent"
 
-    def test_get_cached_miss(self) -> None:
-        client = HIBPClient()
-        assert client._get_cached("ABCDE") is None
+    def test_get_cached_miss(self, hibp_client: HIBPClient) -> None:
+        assert hibp_client._get_cached("ABCDE") is None
 
-    def test_get_cached_hit(self) -> None:
-        client = HIBPClient()
-        client._cache["ABCDE"] = CacheEntry(body="cached_body", expires_at=time.time() + 100)
-        assert client._get_cached("ABCDE") == "cached_body"
+    def test_get_cached_hit(
+        self, hibp_client: HIBPClient, freeze_hibp_clock: Callable[[float], None]
+    ) -> None:
+        freeze_hibp_clock(_NOW)
+        hibp_client._cache["ABCDE"] = CacheEntry(body="cached_body", expires_at=_NOW + 100)
+        assert hibp_client._get_cached("ABCDE") == "cached_body"
 
-    def test_get_cached_expired(self) -> None:
-        client = HIBPClient()
-        client._cache["ABCDE"] = CacheEntry(body="expired_body", expires_at=time.time() - 100)
-        assert client._get_cached("ABCDE") is None
+    def test_get_cached_expired(
+        self, hibp_client: HIBPClient, freeze_hibp_clock: Callable[[float], None]
+    ) -> None:
+        freeze_hibp_clock(_NOW + 1000)
+        hibp_client._cache["ABCDE"] = CacheEntry(body="expired_body", expires_at=_NOW + 100)
+        assert hibp_client._get_cached("ABCDE") is None
 
     def test_set_cache(self) -> None:
         client = HIBPClient(ttl_seconds=60)
@@ -103,81 +146,68 @@ class TestHIBPClient:
         assert client._cache["FGHIJ"].body == "new_body"
         assert client._cache["FGHIJ"].expires_at > time.time()
 
-    def test_range_query_uses_cache(self) -> None:
-        client = HIBPClient()
-        client._cache["ABCDE"] = CacheEntry(body="cached_response", expires_at=time.time() + 100)
-        result = client.range_query("ABCDE")
+    def test_range_query_uses_cache(self, hibp_client: HIBPClient) -> None:
+        hibp_client._cache["ABCDE"] = CacheEntry(
+            body="cached_response", expires_at=time.time() + 100
+        )
+        result = hibp_client.range_query("ABCDE")
         assert result == "cached_response"
 
-    def test_range_query_network_call(self) -> None:
-        client = HIBPClient()
-        mock_response = MagicMock()
-        mock_response.text = "SUFFIX1:10\nSUFFIX2:5"
-        mock_response.raise_for_status = MagicMock()
-        client._http = MagicMock()
-        client._http.get.return_value = mock_response
+    def test_range_query_network_call(
+        self, hibp_client: HIBPClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        requested: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request)
+            return httpx.Response(200, text="SUFFIX1:10\nSUFFIX2:5")
+
+        with httpx.Client(transport=httpx.MockTransport(handler)) as http:
+            monkeypatch.setattr(hibp_client, "_http", http)
+            result = hibp_client.range_query("ABCDE")
 
-        result = client.range_query("ABCDE")
         assert result == "SUFFIX1:10\nSUFFIX2:5"
-        client._http.get.assert_called_once()
+        assert len(requested) == 1
+        assert requested[0].url.path == "/range/ABCDE"
         # Should be cached now
-        assert "ABCDE" in client._cache
-
-    def test_is_breached_found(self) -> None:
-        client = HIBPClient()
-        password = "password123"
-        full_hash = sha1_hex(password)
-        _, suffix = full_hash[:5], full_hash[5:]
-        # Mock range_query to return the suffix
-        client.range_query = MagicMock(return_value=f"{suffix}:42\nOTHER:1")
-        result = client.is_breached(password)
-        assert result is True
-
-    def test_is_breached_not_found(self) -> None:
-        client = HIBPClient()
-        client.range_query = MagicMock(return_value="NOTMATCH:5\nALSONOT:2")
-        result = client.is_breached("unique_password_abc123")
-        assert result is False
-
-    def test_is_breached_fail_open(self) -> None:
-        client = HIBPClient()
-        client.range_query = MagicMock(side_effect=Exception("Network error"))
+        assert "ABCDE" in hibp_client._cache
+
+    @pytest.mark.parametrize(
+        ("payload_builder", "password", "expected"),
+        [
+            (lambda sfx: f"{sfx}:42\nOTHER:1", "password123", True),
+            (lambda sfx: "NOTMATCH:5\nALSONOT:2", "unique_password_abc123", False),
+            (lambda sfx: "SUFFIX:10\n\nANOTHER:5", "test_password", False),
+            (lambda sfx: "INVALID_LINE\nSUFFIX:10", "test_password", False),
+            # Count 0 is not a breach
+            (lambda sfx: f"{sfx}:0", "test", False),
+            # Unparseable count fails safe
+            (lambda sfx: f"{sfx}:invalid", "test", True),
+        ],
+        ids=["found", "not_found", "empty_line", "malformed_line", "count_zero", "invalid_count"],
+    )
+    def test_is_breached(
+        self,
+        hibp_client: HIBPClient,
+        monkeypatch: pytest.MonkeyPatch,
+        payload_builder: Callable[[str], str],
+        password: str,
+        expected: bool,
+    ) -> None:
+        body = payload_builder(_SHA1_CACHE[password][5:])
+        monkeypatch.setattr(hibp_client, "range_query", MagicMock(return_value=body))
+        assert hibp_client.is_breached(password) is expected
+
+    def test_is_breached_fail_open(
+        self, hibp_client: HIBPClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            hibp_client, "range_query", MagicMock(side_effect=Exception("Network error"))
+        )
         # Should fail open (return False on error)
-        result = client.is_breached("any_password")
-        assert result is False
-
-    def test_is_breached_empty_line(self) -> None:
-        client = HIBPClient()
-        client.range_query = MagicMock(return_value="SUFFIX:10\n\nANOTHER:5")
-        result = client.is_breached("test_password")
-        assert isinstance(result, bool)
-
-    def test_is_breached_malformed_line(self) -> None:
-        client = HIBPClient()
-        client.range_query = MagicMock(return_value="INVALID_LINE\nSUFFIX:10")
-        result = client.is_breached("test_password")
-        assert isinstance(result, bool)
-
-    def test_is_breached_count_zero(self) -> None:
-        client = HIBPClient()
-        password = "test"
-        full_hash = sha1_hex(password)
-        suffix = full_hash[5:]
-        client.range_query = MagicMock(return_value=f"{suffix}:0")
-        # Count 0 should return False
-        result = client.is_breached(password)
+        result = hibp_client.is_breached("any_password")
         assert result is False
 
-    def test_is_breached_invalid_count(self) -> None:
-        client = HIBPClient()
-        password = "test"
-        full_hash = sha1_hex(password)
-        suffix = full_hash[5:]
-        client.range_query = MagicMock(return_value=f"{suffix}:invalid")
-        # Invalid count should return True (fail safe)
-        result = client.is_breached(password)
-        assert result is True
-
 
 # ============== Lockout Tests ==============
 
@@ -191,98 +221,86 @@ class MockFailedAuthAttempt:
 
 
 class TestRecordAttempt:
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio
+
     async def test_record_attempt_adds_to_session(self) -> None:
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.flush = AsyncMock()
+        mock_session = AsyncMock(spec_set=AsyncSession)
 
-        user_id = uuid.uuid4()
+        user_id = _uid()
         await record_attempt(mock_session, user_id=user_id, ip_hash="abc123", success=False)
 
         mock_session.add.assert_called_once()
         mock_session.flush.assert_awaited_once()
 
-    @pytest.mark.asyncio
     async def test_record_attempt_success(self) -> None:
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.flush = AsyncMock()
+        mock_session = AsyncMock(spec_set=AsyncSession)
 
         await record_attempt(mock_session, user_id=None, ip_hash="xyz789", success=True)
 
         mock_session.add.assert_called_once()
 
 
+@pytest.fixture
+def lockout_session_factory() -> Callable[[list[Any]], AsyncMock]:
+    """Build a session whose ``execute().scalars().all()`` returns ``rows``."""
+
+    def make(rows: list[Any]) -> AsyncMock:
+        session = AsyncMock(spec_set=AsyncSession)
+        result = MagicMock()
+        scalars = MagicMock()
+        scalars.all.return_value = rows
+        result.scalars.return_value = scalars
+        session.execute = AsyncMock(return_value=result)
+        return session
+
+    return make
+
+
 class TestGetLockoutStatus:
-    @pytest.mark.asyncio
-    async def test_get_lockout_status_no_failures(self) -> None:
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    pytestmark = pytest.mark.asyncio
 
-        status = await get_lockout_status(mock_session, user_id=uuid.uuid4(), ip_hash="test_hash")
+    async def test_get_lockout_status_no_failures(
+        self, lockout_session_factory: Callable[[list[Any]], AsyncMock]
+    ) -> None:
+        status = await get_lockout_status(
+            lockout_session_factory([]), user_id=_uid(), ip_hash="test_hash"
+        )
 
         assert status.locked is False
         assert status.failure_count == 0
 
-    @pytest.mark.asyncio
-    async def test_get_lockout_status_at_threshold(self) -> None:
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        # Return 5 failures (at threshold)
-        mock_scalars.all.return_value = [MagicMock() for _ in range(5)]
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    async def test_get_lockout_status_at_threshold(
+        self, lockout_session_factory: Callable[[list[Any]], AsyncMock]
+    ) -> None:
+        # Return 5 failures (at threshold); get_lockout_status only counts rows
+        session = lockout_session_factory([None] * 5)
 
         cfg = LockoutConfig(threshold=5)
-        status = await get_lockout_status(
-            mock_session, user_id=uuid.uuid4(), ip_hash="test_hash", cfg=cfg
-        )
+        status = await get_lockout_status(session, user_id=_uid(), ip_hash="test_hash", cfg=cfg)
 
         assert status.locked is True
         assert status.failure_count == 5
 
-    @pytest.mark.asyncio
-    async def test_get_lockout_status_user_id_only(self) -> None:
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        status = await get_lockout_status(mock_session, user_id=uuid.uuid4(), ip_hash=None)
+    async def test_get_lockout_status_user_id_only(
+        self, lockout_session_factory: Callable[[list[Any]], AsyncMock]
+    ) -> None:
+        status = await get_lockout_status(lockout_session_factory([]), user_id=_uid(), ip_hash=None)
 
         assert status.locked is False
 
-    @pytest.mark.asyncio
-    async def test_get_lockout_status_ip_hash_only(self) -> None:
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        status = await get_lockout_status(mock_session, user_id=None, ip_hash="hash123")
+    async def test_get_lockout_status_ip_hash_only(
+        self, lockout_session_factory: Callable[[list[Any]], AsyncMock]
+    ) -> None:
+        status = await get_lockout_status(
+            lockout_session_factory([]), user_id=None, ip_hash="hash123"
+        )
 
         assert status.locked is False
 
-    @pytest.mark.asyncio
-    async def test_get_lockout_status_no_filters(self) -> None:
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_result.scalars.return_value = mock_scalars
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        status = await get_lockout_status(mock_session, user_id=None, ip_hash=None)
+    async def test_get_lockout_status_no_filters(
+        self, lockout_session_factory: Callable[[list[Any]], AsyncMock]
+    ) -> None:
+        status = await get_lockout_status(lockout_session_factory([]), user_id=None, ip_hash=None)
 
         assert status.locked is False
 
@@ -304,68 +322,94 @@ class TestComputeLockoutEdgeCases:
 # ============== JWT Rotation Tests ==============
 
 
+_IssuedToken = tuple[JWTStrategy, Any, str]
+
+
+@pytest_asyncio.fixture(scope="module")
+async def audience_list_token() -> _IssuedToken:
+    """Token signed once per module for a multi-audience rotating strategy."""
+    rot = RotatingJWTStrategy(secret="secret", lifetime_seconds=60, token_audience=["aud1", "aud2"])
+    user = type("U", (), {"id": "user-test"})()
+    return rot, user, await rot.write_token(user)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def primary_secret_token() -> _IssuedToken:
+    """Token signed once per module with the rotating strategy's primary secret."""
+    rot = RotatingJWTStrategy(secret="test-secret", lifetime_seconds=60, token_audience="test")
+    user = type("U", (), {"id": str(_uid())})()
+    return rot, user, await rot.write_token(user)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def old_secret_token() -> _IssuedToken:
+    """Token issued with an old secret, paired with a strategy rotated to a new one."""
+    issuer = JWTStrategy(secret="old-secret", lifetime_seconds=60, token_audience="test")
+    user = type("U", (), {"id": str(_uid())})()
+    token = await issuer.write_token(user)
+    rot = RotatingJWTStrategy(
+        secret="new-secret",
+        lifetime_seconds=60,
+        old_secrets=["old-secret"],
+        token_audience="test",
+    )
+    return rot, user, token
+
+
+class _StubUserManager:
+    """Opaque user manager; read_token only forwards it to the patched parent."""
+
+
+@pytest.fixture
+def mock_parent_read_token() -> Iterator[AsyncMock]:
+    """Patch JWTStrategy.read_token (the rotating strategy's parent) for one test."""
+    with patch.object(JWTStrategy, "read_token", new_callable=AsyncMock) as mock_parent:
+        yield mock_parent
+
+
 class TestRotatingJWTStrategyReadToken:
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio
+
     async def test_read_token_none_returns_none(self) -> None:
         rot = RotatingJWTStrategy(secret="secret", lifetime_seconds=60, token_audience="test")
         result = await rot.read_token(None)
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_read_token_with_audience_list(self) -> None:
-        rot = RotatingJWTStrategy(
-            secret="secret", lifetime_seconds=60, token_audience=["aud1", "aud2"]
-        )
-        user = type("U", (), {"id": "user-test"})()
-        token = await rot.write_token(user)
+    async def test_read_token_with_audience_list(self, audience_list_token: _IssuedToken) -> None:
+        rot, _user, token = audience_list_token
         claims = await rot.read_token(token, audience=["aud1", "aud2"])
         assert claims is not None
 
-    @pytest.mark.asyncio
-    async def test_read_token_with_user_manager_primary(self) -> None:
-        secret = "test-secret"
-        rot = RotatingJWTStrategy(secret=secret, lifetime_seconds=60, token_audience="test")
-        user = type("U", (), {"id": str(uuid.uuid4())})()
-        token = await rot.write_token(user)
+    async def test_read_token_with_user_manager_primary(
+        self, primary_secret_token: _IssuedToken, mock_parent_read_token: AsyncMock
+    ) -> None:
+        rot, user, token = primary_secret_token
 
         # Mock user_manager
-        mock_user_manager = AsyncMock()
+        mock_user_manager = _StubUserManager()
         mock_user = MagicMock(id=user.id)
-        # Patch parent's read_token to return user
-        with patch.object(JWTStrategy, "read_token", new_callable=AsyncMock) as mock_parent:
-            mock_parent.return_value = mock_user
-            result = await rot.read_token(token, mock_user_manager)
-            assert result is not None
-
-    @pytest.mark.asyncio
-    async def test_read_token_with_user_manager_old_secret(self) -> None:
-        old_secret = "old-secret"
-        new_secret = "new-secret"
-
-        # Issue with old secret
-        issuer = JWTStrategy(secret=old_secret, lifetime_seconds=60, token_audience="test")
-        user = type("U", (), {"id": str(uuid.uuid4())})()
-        token = await issuer.write_token(user)
+        # Parent's read_token returns the user
+        mock_parent_read_token.return_value = mock_user
+        result = await rot.read_token(token, mock_user_manager)
+        assert result is not None
 
-        rot = RotatingJWTStrategy(
-            secret=new_secret,
-            lifetime_seconds=60,
-            old_secrets=[old_secret],
-            token_audience="test",
-        )
+    async def test_read_token_with_user_manager_old_secret(
+        self, old_secret_token: _IssuedToken, mock_parent_read_token: AsyncMock
+    ) -> None:
+        rot, user, token = old_secret_token
 
         # Mock user_manager
-        mock_user_manager = AsyncMock()
+        mock_user_manager = _StubUserManager()
         mock_user = MagicMock(id=user.id)
 
         # First call (primary) returns None, second (old) returns user
-        with patch.object(JWTStrategy, "read_token", new_callable=AsyncMock) as mock_parent:
-            mock_parent.side_effect = [None, mock_user]
-            result = await rot.read_token(token, mock_user_manager)
-            assert result is not None
+        mock_parent_read_token.side_effect = [None, mock_user]
+        result = await rot.read_token(token, mock_user_manager)
+        assert result is not None
 
-    @pytest.mark.asyncio
-    async def test_read_token_with_user_manager_all_fail(self) -> None:
+    async def test_read_token_with_user_manager_all_fail(
+        self, mock_parent_read_token: AsyncMock
+    ) -> None:
         rot = RotatingJWTStrategy(
             secret="new-secret",
             lifetime_seconds=60,
@@ -373,14 +417,12 @@ class TestRotatingJWTStrategyReadToken:
             token_audience="test",
         )
 
-        mock_user_manager = AsyncMock()
+        mock_user_manager = _StubUserManager()
 
-        with patch.object(JWTStrategy, "read_token", new_callable=AsyncMock) as mock_parent:
-            mock_parent.return_value = None
-            result = await rot.read_token("invalid-token", mock_user_manager)
-            assert result is None
+        mock_parent_read_token.return_value = None
+        result = await rot.read_token("invalid-token", mock_user_manager)
+        assert result is None
 
-    @pytest.mark.asyncio
     async def test_rotating_jwt_no_old_secrets(self) -> None:
         rot = RotatingJWTStrategy(secret="only-secret", lifetime_seconds=60, token_audience=None)
         assert rot._verify_secrets == ["only-secret"]
@@ -389,10 +431,17 @@ class TestRotatingJWTStrategyReadToken:
 # ============== Permissions Tests ==============
 
 
+@dataclass(slots=True)
 class DummyUser:
-    def __init__(self, roles: list[str], uid: uuid.UUID | None = None) -> None:
-        self.id = uid or uuid.uuid4()
-        self.roles = roles
+    roles: list[str]
+    id: uuid.UUID = field(default_factory=_uid)
+
+
+@dataclass(slots=True)
+class _Resource:
+    owner_id: uuid.UUID | None = None
+    user_id: uuid.UUID | None = None
+    author_id: uuid.UUID | None = None
 
 
 class DummyPrincipal:
@@ -400,32 +449,42 @@ class DummyPrincipal:
         self.user = user
 
 
+@pytest.fixture(autouse=True)
+def registry(monkeypatch: pytest.MonkeyPatch) -> dict[str, set[str]]:
+    """Give each test its own PERMISSION_REGISTRY so mutations never leak.
+
+    The permissions helpers resolve the module global at call time, so swapping
+    in a per-test copy isolates tests without any restore step and keeps them
+    safe to run in parallel workers or threads. The sets are copied too because
+    extend_role mutates an existing role's set in place.
+    """
+    isolated = {role: set(perms) for role, perms in permissions_module.PERMISSION_REGISTRY.items()}
+    monkeypatch.setattr(permissions_module, "PERMISSION_REGISTRY", isolated)
+    return isolated
+
+
 class TestRegisterRole:
-    def test_register_role_new(self) -> None:
+    def test_register_role_new(self, registry: dict[str, set[str]]) -> None:
         register_role("test_role_1", {"perm.a", "perm.b"})
-        assert "test_role_1" in PERMISSION_REGISTRY
-        assert PERMISSION_REGISTRY["test_role_1"] == {"perm.a", "perm.b"}
-        # Cleanup
-        del PERMISSION_REGISTRY["test_role_1"]
+        assert "test_role_1" in registry
+        assert registry["test_role_1"] == {"perm.a", "perm.b"}
+        assert "test_role_1" not in PERMISSION_REGISTRY
 
-    def test_register_role_overwrite(self) -> None:
+    def test_register_role_overwrite(self, registry: dict[str, set[str]]) -> None:
         register_role("test_role_2", {"old.perm"})
         register_role("test_role_2", {"new.perm"})
-        assert PERMISSION_REGISTRY["test_role_2"] == {"new.perm"}
-        del PERMISSION_REGISTRY["test_role_2"]
+        assert registry["test_role_2"] == {"new.perm"}
 
 
 class TestExtendRole:
-    def test_extend_role_existing(self) -> None:
+    def test_extend_role_existing(self, registry: dict[str, set[str]]) -> None:
         register_role("test_role_3", {"base.perm"})
         extend_role("test_role_3", {"extra.perm"})
-        assert PERMISSION_REGISTRY["test_role_3"] == {"base.perm", "extra.perm"}
-        del PERMISSION_REGISTRY["test_role_3"]
+        assert registry["test_role_3"] == {"base.perm", "extra.perm"}
 
-    def test_extend_role_new(self) -> None:
+    def test_extend_role_new(self, registry: dict[str, set[str]]) -> None:
         extend_role("test_role_4", {"new.perm"})
-        assert PERMISSION_REGISTRY["test_role_4"] == {"new.perm"}
-        del PERMISSION_REGISTRY["test_role_4"]
+        assert registry["test_role_4"] == {"new.perm"}
 
 
 class TestPrincipalPermissions:
@@ -437,79 +496,80 @@ class TestPrincipalPermissions:
         assert "admin.impersonate" in perms
 
     def test_principal_permissions_no_roles_attr(self) -> None:
-        user = type("U", (), {"id": uuid.uuid4()})()  # No roles attr
+        user = type("U", (), {"id": _uid()})()  # No roles attr
         principal = DummyPrincipal(user)
         perms = principal_permissions(principal)
         # All authenticated users get implicit "user" role with session permissions
         assert perms == {"security.session.list", "security.session.revoke"}
 
     def test_principal_permissions_none_roles(self) -> None:
-        user = type("U", (), {"id": uuid.uuid4(), "roles": None})()
+        user = type("U", (), {"id": _uid(), "roles": None})()
         principal = DummyPrincipal(user)
         perms = principal_permissions(principal)
         # All authenticated users get implicit "user" role with session permissions
         assert perms == {"security.session.list", "security.session.revoke"}
 
 
-class TestMaybeAwait:
-    @pytest.mark.asyncio
-    async def test_maybe_await_sync_value(self) -> None:
-        result = await _maybe_await(42)
-        assert result == 42
+async def _async_100() -> int:
+    return 100
 
-    @pytest.mark.asyncio
-    async def test_maybe_await_async_value(self) -> None:
-        async def async_fn() -> int:
-            return 100
 
-        result = await _maybe_await(async_fn())
-        assert result == 100
+class TestMaybeAwait:
+    pytestmark = pytest.mark.asyncio
+
+    @pytest.mark.parametrize(
+        ("value_factory", "expected"),
+        [(lambda: 42, 42), (_async_100, 100)],
+        ids=["sync_value", "async_value"],
+    )
+    async def test_maybe_await(self, value_factory: Callable[[], Any], expected: int) -> None:
+        assert await _maybe_await(value_factory()) == expected
 
 
 class TestOwnsResource:
     def test_owns_resource_match(self) -> None:
-        uid = uuid.uuid4()
-        user = DummyUser(roles=[], uid=uid)
+        uid = _uid()
+        user = DummyUser(roles=[], id=uid)
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uid})()
+        resource = _Resource(owner_id=uid)
         predicate = owns_resource()
         assert predicate(principal, resource) is True
 
     def test_owns_resource_no_match(self) -> None:
-        user = DummyUser(roles=[], uid=uuid.uuid4())
+        user = DummyUser(roles=[], id=_uid())
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uuid.uuid4()})()
+        resource = _Resource(owner_id=_uid())
         predicate = owns_resource()
         assert predicate(principal, resource) is False
 
     def test_owns_resource_custom_attr(self) -> None:
-        uid = uuid.uuid4()
-        user = DummyUser(roles=[], uid=uid)
+        uid = _uid()
+        user = DummyUser(roles=[], id=uid)
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"author_id": uid})()
+        resource = _Resource(author_id=uid)
         predicate = owns_resource("author_id")
         assert predicate(principal, resource) is True
 
     def test_owns_resource_fallback_user_id(self) -> None:
-        uid = uuid.uuid4()
-        user = DummyUser(roles=[], uid=uid)
+        uid = _uid()
+        user = DummyUser(roles=[], id=uid)
         principal = DummyPrincipal(user)
-        # No owner_id attr, but has user_id
-        resource = type("R", (), {"user_id": uid})()
+        # No owner_id, but has user_id
+        resource = _Resource(user_id=uid)
         predicate = owns_resource()
         assert predicate(principal, resource) is True
 
     def test_owns_resource_missing_attrs(self) -> None:
-        user = DummyUser(roles=[], uid=uuid.uuid4())
+        user = DummyUser(roles=[], id=_uid())
         principal = DummyPrincipal(user)
-        resource = type("R", (), {})()  # No owner_id or user_id
+        resource = _Resource()  # owner_id and user_id both unset
         predicate = owns_resource()
         assert predicate(principal, resource) is False
 
     def test_owns_resource_none_user_id(self) -> None:
         user = type("U", (), {"id": None, "roles": []})()
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uuid.uuid4()})()
+        resource = _Resource(owner_id=_uid())
         predicate = owns_resource()
         assert predicate(principal, resource) is False
 
@@ -518,7 +578,7 @@ class TestEnforceABAC:
     def test_enforce_abac_success(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": user.id})()
+        resource = _Resource(owner_id=user.id)
 
         result = enforce_abac(
             principal,
@@ -531,7 +591,7 @@ class TestEnforceABAC:
     def test_enforce_abac_missing_permission(self) -> None:
         user = DummyUser(roles=[])  # No roles
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": user.id})()
+        resource = _Resource(owner_id=user.id)
 
         with pytest.raises(HTTPException) as exc:
             enforce_abac(
@@ -546,7 +606,7 @@ class TestEnforceABAC:
     def test_enforce_abac_predicate_fails(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uuid.uuid4()})()  # Different owner
+        resource = _Resource(owner_id=_uid())  # Different owner
 
         with pytest.raises(HTTPException) as exc:
             enforce_abac(
@@ -561,7 +621,7 @@ class TestEnforceABAC:
     def test_enforce_abac_async_predicate_raises(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
-        resource = type("R", (), {})()
+        resource = _Resource()
 
         async def async_predicate(p: Any, r: Any) -> bool:
             return True
@@ -577,138 +637,109 @@ class TestEnforceABAC:
 
 
 class TestRequirePermission:
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio
+
+    # Guards are stateless; build each one once per class
+    guard_read = RequirePermission("user.read")
+    guard_read_write = RequirePermission("user.read", "user.write")
+    guard_any_read_or_impersonate = RequireAnyPermission("user.read", "admin.impersonate")
+    # Use permissions that no role has (including implicit "user" role)
+    guard_any_unheld = RequireAnyPermission("admin.impersonate", "nonexistent.permission")
+
     async def test_require_permission_success(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
 
-        guard = RequirePermission("user.read")
         # Extract the dependency callable
-        dep = guard.dependency
-
-        result = await dep(principal)
+        result = await self.guard_read.dependency(principal)
         assert result is principal
 
-    @pytest.mark.asyncio
     async def test_require_permission_missing(self) -> None:
         user = DummyUser(roles=[])
         principal = DummyPrincipal(user)
 
-        guard = RequirePermission("user.read")
-        dep = guard.dependency
-
         with pytest.raises(HTTPException) as exc:
-            await dep(principal)
+            await self.guard_read.dependency(principal)
         assert exc.value.status_code == 403
 
-    @pytest.mark.asyncio
     async def test_require_multiple_permissions(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
 
-        guard = RequirePermission("user.read", "user.write")
-        dep = guard.dependency
-
-        result = await dep(principal)
+        result = await self.guard_read_write.dependency(principal)
         assert result is principal
 
-    @pytest.mark.asyncio
     async def test_require_any_permission_success(self) -> None:
         user = DummyUser(roles=["support"])  # Has user.read, billing.read
         principal = DummyPrincipal(user)
 
-        guard = RequireAnyPermission("user.read", "admin.impersonate")
-        dep = guard.dependency
-
-        result = await dep(principal)
+        result = await self.guard_any_read_or_impersonate.dependency(principal)
         assert result is principal
 
-    @pytest.mark.asyncio
     async def test_require_any_permission_none_match(self) -> None:
         user = DummyUser(roles=["support"])
         principal = DummyPrincipal(user)
 
-        # Use permissions that no role has (including implicit "user" role)
-        guard = RequireAnyPermission("admin.impersonate", "nonexistent.permission")
-        dep = guard.dependency
-
         with pytest.raises(HTTPException) as exc:
-            await dep(principal)
+            await self.guard_any_unheld.dependency(principal)
         assert exc.value.status_code == 403
 
 
+def _unused_resource_getter() -> Any:
+    """Resource provider for the guards; the tests pass the resource in directly."""
+    return None
+
+
+async def _async_owns(p: Any, r: Any) -> bool:
+    return str(p.user.id) == str(r.owner_id)
+
+
 class TestRequireABAC:
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio
+
+    guard_owns = RequireABAC(
+        permission="user.read",
+        predicate=owns_resource(),
+        resource_getter=_unused_resource_getter,
+    )
+    guard_async_owns = RequireABAC(
+        permission="user.read",
+        predicate=_async_owns,
+        resource_getter=_unused_resource_getter,
+    )
+
     async def test_require_abac_success(self) -> None:
-        uid = uuid.uuid4()
-        user = DummyUser(roles=["admin"], uid=uid)
+        uid = _uid()
+        user = DummyUser(roles=["admin"], id=uid)
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uid})()
-
-        def getter() -> Any:
-            return resource
-
-        guard = RequireABAC(
-            permission="user.read", predicate=owns_resource(), resource_getter=getter
-        )
-        dep = guard.dependency
+        resource = _Resource(owner_id=uid)
 
-        result = await dep(principal, resource)
+        result = await self.guard_owns.dependency(principal, resource)
         assert result is principal
 
-    @pytest.mark.asyncio
     async def test_require_abac_missing_permission(self) -> None:
         user = DummyUser(roles=[])
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": user.id})()
-
-        def getter() -> Any:
-            return resource
-
-        guard = RequireABAC(
-            permission="user.read", predicate=owns_resource(), resource_getter=getter
-        )
-        dep = guard.dependency
+        resource = _Resource(owner_id=user.id)
 
         with pytest.raises(HTTPException) as exc:
-            await dep(principal, resource)
+            await self.guard_owns.dependency(principal, resource)
         assert exc.value.status_code == 403
 
-    @pytest.mark.asyncio
     async def test_require_abac_predicate_fails(self) -> None:
         user = DummyUser(roles=["admin"])
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uuid.uuid4()})()
-
-        def getter() -> Any:
-            return resource
-
-        guard = RequireABAC(
-            permission="user.read", predicate=owns_resource(), resource_getter=getter
-        )
-        dep = guard.dependency
+        resource = _Resource(owner_id=_uid())
 
         with pytest.raises(HTTPException) as exc:
-            await dep(principal, resource)
+            await self.guard_owns.dependency(principal, resource)
         assert exc.value.status_code == 403
 
-    @pytest.mark.asyncio
     async def test_require_abac_async_predicate(self) -> None:
-        uid = uuid.uuid4()
-        user = DummyUser(roles=["admin"], uid=uid)
+        uid = _uid()
+        user = DummyUser(roles=["admin"], id=uid)
         principal = DummyPrincipal(user)
-        resource = type("R", (), {"owner_id": uid})()
-
-        async def async_predicate(p: Any, r: Any) -> bool:
-            return str(p.user.id) == str(r.owner_id)
-
-        def getter() -> Any:
-            return resource
-
-        guard = RequireABAC(
-            permission="user.read", predicate=async_predicate, resource_getter=getter
-        )
-        dep = guard.dependency
+        resource = _Resource(owner_id=uid)
 
-        result = await dep(principal, resource)
+        result = await self.guard_async_owns.dependency(principal, resource)
         assert result is principal
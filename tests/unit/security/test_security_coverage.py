@@ -8,15 +8,19 @@ Targets remaining uncovered lines in:
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import uuid
 from datetime import UTC, datetime
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import MagicMock
 
 import pytest
 
 from svc_infra.security.audit import (
     AuditEvent,
+    AuditWriter,
     InMemoryAuditLogStore,
     append_audit_event,
     verify_audit_chain,
@@ -24,6 +28,7 @@ from svc_infra.security.audit import (
 from svc_infra.security.signed_cookies import (
     _b64d,
     _b64e,
+    _dumps,
     _now,
     _sign,
     sign_cookie,
@@ -51,6 +56,10 @@ class TestBase64Helpers:
             decoded = _b64d(encoded)
             assert decoded == s
 
+    def test_b64e_matches_stdlib_urlsafe(self) -> None:
+        for s in [b"", b"\xfb\xff", b"hello?>", bytes(range(256))]:
+            assert _b64e(s) == base64.urlsafe_b64encode(s).rstrip(b"=").decode()
+
 
 class TestSign:
     def test_sign_produces_string(self) -> None:
@@ -64,6 +73,30 @@ class TestSign:
         assert result1 == result2
 
 
+class TestPayloadCodec:
+    def test_dumps_matches_compact_sorted_json(self) -> None:
+        body = {"sub": "u", "exp": 10, "a": [1, None, True]}
+        assert _dumps(body) == json.dumps(body, separators=(",", ":"), sort_keys=True).encode()
+
+    def test_dumps_non_str_keys(self) -> None:
+        assert _dumps({1: "x"}) == b'{"1":"x"}'
+
+    def test_dumps_escapes_non_ascii(self) -> None:
+        assert _dumps({"sub": "ü"}) == b'{"sub":"\\u00fc"}'
+
+    def test_dumps_rejects_non_json_values(self) -> None:
+        with pytest.raises(TypeError):
+            _dumps({"ts": datetime.now(UTC)})
+        with pytest.raises(TypeError):
+            _dumps({"id": uuid.uuid4()})
+
+    def test_cookie_round_trip(self) -> None:
+        body = {"sub": "ü", "n": 1}
+        ok, payload = verify_cookie(sign_cookie(body, key="k1"), key="k1")
+        assert ok is True
+        assert payload == body
+
+
 class TestNow:
     def test_now_returns_int(self) -> None:
         result = _now()
@@ -115,6 +148,10 @@ class TestSignCookieEdgeCases:
         assert not ok
         assert payload is None
 
+    @pytest.mark.parametrize("value", [".sig", "body.", "."])
+    def test_verify_cookie_empty_segment(self, value: str) -> None:
+        assert verify_cookie(value, key="k1") == (False, None)
+
     def test_verify_cookie_exception_handling(self) -> None:
         # Malformed base64
         ok, payload = verify_cookie("!!!.sig", key="k1")
@@ -199,6 +236,13 @@ class TestInMemoryAuditLogStore:
         events = store.list(tenant_id="t1", limit=2)
         assert len(events) == 2
         assert all(e.tenant_id == "t1" for e in events)
+        assert [e.event_type for e in events] == ["e3", "e4"]
+
+    def test_list_unknown_tenant(self) -> None:
+        store = InMemoryAuditLogStore()
+        store.append(event_type="e1", tenant_id="t1")
+        assert store.list(tenant_id="missing") == []
+        assert store.list(tenant_id="missing", limit=2) == []
 
 
 class TestAuditEvent:
@@ -216,6 +260,19 @@ class TestAuditEvent:
         assert event.tenant_id == "t1"
         assert event.event_type == "test"
 
+    def test_audit_event_is_slotted_and_frozen(self) -> None:
+        event = AuditEvent(
+            ts=datetime.now(UTC),
+            actor_id=None,
+            tenant_id=None,
+            event_type="test",
+            resource_ref=None,
+            metadata={},
+        )
+        assert not hasattr(event, "__dict__")
+        with pytest.raises(AttributeError):
+            event.event_type = "changed"  # type: ignore[misc]
+
 
 # ============== Append Audit Event Additional Tests ==============
 
@@ -243,11 +300,23 @@ class FakeDBWithExecute:
         pass
 
     async def execute(self, stmt: Any) -> Any:
-        mock_result = MagicMock()
-        mock_scalars = MagicMock()
-        mock_scalars.first.return_value = self.return_event
-        mock_result.scalars.return_value = mock_scalars
-        return mock_result
+        return _Result(self.return_event)
+
+
+class _Scalars:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def first(self) -> Any:
+        return self._value
+
+
+class _Result:
+    def __init__(self, value: Any) -> None:
+        self._scalars = _Scalars(value)
+
+    def scalars(self) -> _Scalars:
+        return self._scalars
 
 
 class TestAppendAuditEventEdgeCases:
@@ -287,6 +356,151 @@ class TestAppendAuditEventEdgeCases:
         assert event.event_metadata == {"action": "update"}
 
 
+class BatchingDB(FakeDB):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+        self.flushes = 0
+
+    def add_all(self, objs: list[Any]) -> None:
+        self.batches.append(len(objs))
+        self.added.extend(objs)
+
+    async def flush(self) -> None:
+        self.flushes += 1
+
+
+class FailingFlushDB(FakeDB):
+    async def flush(self) -> None:
+        raise RuntimeError("flush failed")
+
+
+class YieldingLookupDB(BatchingDB):
+    """Persists on flush and serves the latest row from an execute() that yields."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.persisted: list[Any] = []
+
+    async def flush(self) -> None:
+        await super().flush()
+        self.persisted.extend(self.added[len(self.persisted) :])
+
+    async def execute(self, stmt: Any) -> Any:
+        await asyncio.sleep(0)
+        return _Result(self.persisted[-1] if self.persisted else None)
+
+
+class FlakyFlushDB(FakeDB):
+    """Fails the next ``fail_next`` flushes, dropping rows added since the last good flush."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail_next = 0
+        self.persisted: list[Any] = []
+
+    async def flush(self) -> None:
+        pending, self.added = self.added, []
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("flush failed")
+        self.persisted.extend(pending)
+
+
+class TestAuditWriter:
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_one_flush(self) -> None:
+        db = BatchingDB()
+        writer = AuditWriter(db, batch_size=10)
+        rows = await asyncio.gather(
+            *(
+                append_audit_event(db, tenant_id="t1", event_type=f"e{i}", writer=writer)
+                for i in range(5)
+            )
+        )
+        assert db.batches == [5]
+        assert db.flushes == 1
+        assert db.added == list(rows)
+        assert verify_audit_chain(rows) == (True, [])
+
+    @pytest.mark.asyncio
+    async def test_batch_size_splits_flushes(self) -> None:
+        db = BatchingDB()
+        writer = AuditWriter(db, batch_size=2)
+        await asyncio.gather(*(writer.submit(SimpleNamespace(tenant_id=None)) for _ in range(5)))
+        assert db.batches == [2, 2, 1]
+        assert db.flushes == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_error_propagates_to_submitters(self) -> None:
+        writer = AuditWriter(FailingFlushDB())
+        with pytest.raises(RuntimeError):
+            await append_audit_event(None, event_type="e", writer=writer)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_appends_do_not_fork_chain(self) -> None:
+        db = YieldingLookupDB()
+        writer = AuditWriter(db)
+        rows = await asyncio.gather(
+            *(
+                append_audit_event(db, tenant_id="t1", event_type=f"e{i}", writer=writer)
+                for i in range(3)
+            )
+        )
+        assert db.persisted == list(rows)
+        assert verify_audit_chain(rows) == (True, [])
+
+    @pytest.mark.asyncio
+    async def test_first_append_chains_from_stored_event(self) -> None:
+        db = YieldingLookupDB()
+        stored = await append_audit_event(db, tenant_id="t1", event_type="e0")
+        assert db.persisted == [stored]
+        writer = AuditWriter(db)
+        rows = await asyncio.gather(
+            *(
+                append_audit_event(db, tenant_id="t1", event_type=f"e{i}", writer=writer)
+                for i in range(1, 3)
+            )
+        )
+        assert verify_audit_chain([stored, *rows]) == (True, [])
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_does_not_advance_chain(self) -> None:
+        db = FlakyFlushDB()
+        writer = AuditWriter(db)
+        first = await append_audit_event(db, tenant_id="t1", event_type="e1", writer=writer)
+
+        db.fail_next = 1
+        with pytest.raises(RuntimeError):
+            await append_audit_event(db, tenant_id="t1", event_type="e2", writer=writer)
+        assert writer.last_event("t1") is first
+
+        third = await append_audit_event(db, tenant_id="t1", event_type="e3", writer=writer)
+        assert third.prev_hash == first.hash
+        assert db.persisted == [first, third]
+        assert verify_audit_chain(db.persisted) == (True, [])
+
+    @pytest.mark.asyncio
+    async def test_rows_chained_from_failed_row_are_not_persisted(self) -> None:
+        db = FlakyFlushDB()
+        db.fail_next = 1
+        writer = AuditWriter(db, batch_size=1)
+        results = await asyncio.gather(
+            *(
+                append_audit_event(db, tenant_id="t1", event_type=f"e{i}", writer=writer)
+                for i in range(3)
+            ),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert db.persisted == []
+        assert writer.last_event("t1") is None
+
+        fresh = await append_audit_event(db, tenant_id="t1", event_type="e3", writer=writer)
+        assert db.persisted == [fresh]
+        assert verify_audit_chain(db.persisted) == (True, [])
+
+
 # ============== Verify Audit Chain Additional Tests ==============
 
 
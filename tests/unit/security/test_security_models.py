@@ -3,7 +3,10 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
+import pytest
+
 from svc_infra.security.models import (
+    _audit_hasher,
     compute_audit_hash,
     generate_refresh_token,
     hash_refresh_token,
@@ -89,3 +92,39 @@ def test_audit_hash_chain_continuity():
         metadata={"reason": "user_initiated"},
     )
     assert h3_r == h3
+
+
+@pytest.fixture
+def reset_audit_hasher():
+    _audit_hasher.cache_clear()
+    yield
+    _audit_hasher.cache_clear()
+
+
+_AUDIT_KWARGS = {
+    "ts": datetime(2025, 1, 1, tzinfo=UTC),
+    "actor_id": None,
+    "tenant_id": "t",
+    "event_type": "login",
+    "resource_ref": None,
+    "metadata": {},
+}
+
+
+def test_audit_hash_algo_opt_in(monkeypatch, reset_audit_hasher):
+    default = compute_audit_hash(None, **_AUDIT_KWARGS)
+    monkeypatch.setenv("AUDIT_HASH_ALGO", "blake2b")
+    _audit_hasher.cache_clear()
+    blake = compute_audit_hash(None, **_AUDIT_KWARGS)
+    assert len(blake) == 64 and blake != default
+    monkeypatch.setenv("AUDIT_HASH_ALGO", "md5")
+    _audit_hasher.cache_clear()
+    with pytest.raises(ValueError):
+        compute_audit_hash(None, **_AUDIT_KWARGS)
+
+
+def test_audit_hash_algo_fixed_after_first_use(monkeypatch, reset_audit_hasher):
+    default = compute_audit_hash(None, **_AUDIT_KWARGS)
+    monkeypatch.setenv("AUDIT_HASH_ALGO", "blake2b")
+    # A chain must not switch algorithm part-way through a process
+    assert compute_audit_hash(None, **_AUDIT_KWARGS) == default
@@ -45,3 +45,19 @@ def test_expiration(monkeypatch: object):
     monkeypatch.setattr(_mod, "_now", lambda: fake_now + 11)  # type: ignore[attr-defined]
     ok2, _ = verify_cookie(val, key="k")
     assert not ok2
+
+
+def test_repeat_verification_uses_cache(monkeypatch: object):
+    _mod._verify_cache.clear()
+    val = sign_cookie({"sub": "u"}, key="k")
+    assert verify_cookie(val, key="k")[0]
+
+    calls = []
+    real_sign = _mod._sign
+    monkeypatch.setattr(_mod, "_sign", lambda d, k: calls.append(d) or real_sign(d, k))  # type: ignore[attr-defined]
+    ok, payload = verify_cookie(val, key="k")
+    assert ok and payload == {"sub": "u"}
+    assert calls == []
+    # A different key is a cache miss and still fails
+    assert verify_cookie(val, key="other") == (False, None)
+    assert calls
@@ -11,18 +11,19 @@ import os
 import tempfile
 import warnings
 from pathlib import Path
-from unittest.mock import patch
 
 import httpx
+import pytest
 
 from svc_infra.http.client import (
-    _merge_request_id_header,
     _parse_float_env,
     get_default_timeout_seconds,
     get_request_id,
     make_timeout,
+    merge_request_id_header,
     new_async_httpx_client,
     new_httpx_client,
+    reset_request_id,
     set_request_id,
 )
 from svc_infra.utils import (
@@ -36,6 +37,16 @@ from svc_infra.utils import (
 # ============== HTTP Client Tests ==============
 
 
+@pytest.fixture(autouse=True)
+def _isolate_http_state(monkeypatch: pytest.MonkeyPatch):
+    """Run each test with no request ID and none of the env vars read here."""
+    monkeypatch.delenv("TEST_FLOAT_VAR", raising=False)
+    monkeypatch.delenv("HTTP_CLIENT_TIMEOUT_SECONDS", raising=False)
+    token = set_request_id(None)
+    yield
+    reset_request_id(token)
+
+
 class TestRequestIdContext:
     def test_set_and_get_request_id(self) -> None:
         set_request_id("test-request-123")
@@ -43,67 +54,74 @@ class TestRequestIdContext:
         set_request_id(None)
         assert get_request_id() is None
 
-    def test_merge_request_id_header_with_id(self) -> None:
+    def test_reset_request_id_restores_previous(self) -> None:
+        outer = set_request_id("outer")
+        inner = set_request_id("inner")
+        assert get_request_id() == "inner"
+        reset_request_id(inner)
+        assert get_request_id() == "outer"
+        reset_request_id(outer)
+        assert get_request_id() is None
+
+    def testmerge_request_id_header_with_id(self) -> None:
         set_request_id("req-456")
-        result = _merge_request_id_header({"Content-Type": "application/json"})
+        result = merge_request_id_header({"Content-Type": "application/json"})
         assert result["X-Request-Id"] == "req-456"
         assert result["Content-Type"] == "application/json"
-        set_request_id(None)
 
-    def test_merge_request_id_header_without_id(self) -> None:
-        set_request_id(None)
-        result = _merge_request_id_header({"Content-Type": "text/plain"})
+    def testmerge_request_id_header_without_id(self) -> None:
+        result = merge_request_id_header({"Content-Type": "text/plain"})
         assert "X-Request-Id" not in result
         assert result["Content-Type"] == "text/plain"
 
-    def test_merge_request_id_header_none_headers(self) -> None:
+    def testmerge_request_id_header_none_headers(self) -> None:
         set_request_id("req-789")
-        result = _merge_request_id_header(None)
+        result = merge_request_id_header(None)
         assert result["X-Request-Id"] == "req-789"
-        set_request_id(None)
 
-    def test_merge_request_id_header_existing_id(self) -> None:
+    def testmerge_request_id_header_existing_id(self) -> None:
         set_request_id("new-id")
         # Existing X-Request-Id should not be overwritten
-        result = _merge_request_id_header({"X-Request-Id": "existing-id"})
+        result = merge_request_id_header({"X-Request-Id": "existing-id"})
         assert result["X-Request-Id"] == "existing-id"
-        set_request_id(None)
+
+    def test_merge_request_id_header_is_public(self) -> None:
+        from svc_infra import http
+
+        assert http.merge_request_id_header is merge_request_id_header
+        assert "merge_request_id_header" in http.__all__
 
 
 class TestParseFloatEnv:
     def test_parse_float_env_not_set(self) -> None:
-        with patch.dict(os.environ, {}, clear=False):
-            os.environ.pop("TEST_FLOAT_VAR", None)
-            result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
-            assert result == 5.0
+        result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
+        assert result == 5.0
 
-    def test_parse_float_env_empty_string(self) -> None:
-        with patch.dict(os.environ, {"TEST_FLOAT_VAR": ""}):
-            result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
-            assert result == 5.0
+    def test_parse_float_env_empty_string(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEST_FLOAT_VAR", "")
+        result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
+        assert result == 5.0
 
-    def test_parse_float_env_valid_float(self) -> None:
-        with patch.dict(os.environ, {"TEST_FLOAT_VAR": "15.5"}):
-            result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
-            assert result == 15.5
+    def test_parse_float_env_valid_float(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEST_FLOAT_VAR", "15.5")
+        result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
+        assert result == 15.5
 
-    def test_parse_float_env_invalid(self) -> None:
-        with patch.dict(os.environ, {"TEST_FLOAT_VAR": "not-a-float"}):
-            result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
-            assert result == 5.0
+    def test_parse_float_env_invalid(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TEST_FLOAT_VAR", "not-a-float")
+        result = _parse_float_env("TEST_FLOAT_VAR", 5.0)
+        assert result == 5.0
 
 
 class TestGetDefaultTimeoutSeconds:
-    def test_get_default_timeout_from_env(self) -> None:
-        with patch.dict(os.environ, {"HTTP_CLIENT_TIMEOUT_SECONDS": "30.0"}):
-            result = get_default_timeout_seconds()
-            assert result == 30.0
+    def test_get_default_timeout_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("HTTP_CLIENT_TIMEOUT_SECONDS", "30.0")
+        result = get_default_timeout_seconds()
+        assert result == 30.0
 
     def test_get_default_timeout_fallback(self) -> None:
-        with patch.dict(os.environ, {}, clear=False):
-            os.environ.pop("HTTP_CLIENT_TIMEOUT_SECONDS", None)
-            result = get_default_timeout_seconds()
-            assert result == 10.0
+        result = get_default_timeout_seconds()
+        assert result == 10.0
 
 
 class TestMakeTimeout:
@@ -115,6 +133,10 @@ class TestMakeTimeout:
         timeout = make_timeout(None)
         assert isinstance(timeout, httpx.Timeout)
 
+    def test_make_timeout_reuses_instance(self) -> None:
+        assert make_timeout(20.0) is make_timeout(20.0)
+        assert make_timeout(20.0).read == 20.0
+
 
 class TestNewHttpxClient:
     def test_new_httpx_client_default(self) -> None:
@@ -142,14 +164,25 @@ class TestNewHttpxClient:
         client = new_httpx_client(propagate_request_id=False)
         assert isinstance(client, httpx.Client)
         client.close()
-        set_request_id(None)
 
     def test_new_httpx_client_with_request_id(self) -> None:
         set_request_id("test-request-id")
         client = new_httpx_client(headers={"Other": "header"})
         assert isinstance(client, httpx.Client)
         client.close()
+
+    def test_new_httpx_client_headers_are_isolated(self) -> None:
+        set_request_id("rid-1")
+        first = new_httpx_client(headers={"X-Custom": "value"})
         set_request_id(None)
+        second = new_httpx_client(headers={"X-Custom": "value"})
+        first.headers["X-Mutated"] = "1"
+        assert first.headers["X-Request-Id"] == "rid-1"
+        assert second.headers["X-Custom"] == "value"
+        assert "X-Request-Id" not in second.headers
+        assert "X-Mutated" not in second.headers
+        first.close()
+        second.close()
 
 
 class TestNewAsyncHttpxClient:
@@ -169,7 +202,6 @@ class TestNewAsyncHttpxClient:
         set_request_id("async-test-id")
         client = new_async_httpx_client(propagate_request_id=False)
         assert isinstance(client, httpx.AsyncClient)
-        set_request_id(None)
 
 
 # ============== Utils Tests ==============
@@ -207,6 +239,16 @@ class TestWrite:
             assert result["action"] == "wrote"
             assert path.read_text() == "new content"
 
+    def test_write_replaces_atomically_and_keeps_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "existing.txt"
+            path.write_text("original")
+            path.chmod(0o640)
+            write(path, "new content", overwrite=True)
+            assert path.stat().st_mode & 0o777 == 0o640
+            # No temp files are left behind next to the target
+            assert os.listdir(tmpdir) == ["existing.txt"]
+
 
 class TestEnsureInitPy:
     def test_ensure_init_py_basic(self) -> None:
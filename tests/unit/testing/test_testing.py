@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import fnmatch
+import re
 import time
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
@@ -24,6 +26,8 @@ from svc_infra.testing import (
     pytest_fixtures,
 )
 
+_USER_GLOB = re.compile(fnmatch.translate("user:*"))
+
 # =============================================================================
 # CacheEntry Tests
 # =============================================================================
@@ -47,6 +51,12 @@ class TestCacheEntry:
         entry = CacheEntry(value="test", expires_at=time.time() - 1)
         assert entry.is_expired()
 
+    def test_entry_expired_at_given_time(self):
+        """A pre-sampled timestamp is used instead of the clock."""
+        entry = CacheEntry(value="test", expires_at=100.0)
+        assert not entry.is_expired(now=100.0)
+        assert entry.is_expired(now=100.5)
+
 
 # =============================================================================
 # MockCache Tests
@@ -154,6 +164,47 @@ class TestMockCache:
         assert cache.get("user:2") is None
         assert cache.get("order:1") == "v3"
 
+    def test_delete_pattern_accepts_compiled(self):
+        """Precompiled patterns match the same keys as the glob string."""
+        cache = MockCache()
+        cache.set("user:1", "v1")
+        cache.set("user:2", "v2")
+        cache.set("order:1", "v3")
+        assert sorted(cache.keys(_USER_GLOB)) == sorted(cache.keys("user:*"))
+        assert cache.delete_pattern(_USER_GLOB) == 2
+        assert cache.keys() == ["order:1"]
+
+    def test_delete_pattern_non_prefix_glob(self):
+        """Patterns with inner wildcards fall back to regex matching."""
+        cache = MockCache()
+        cache.set("user:1:profile", "v1")
+        cache.set("user:2:profile", "v2")
+        cache.set("user:2:settings", "v3")
+        assert cache.delete_pattern("user:?:profile") == 2
+        assert cache.keys() == ["user:2:settings"]
+
+    def test_keys_prefix_index_tracks_deletes(self):
+        """Prefix lookups do not return keys that were deleted."""
+        cache = MockCache()
+        cache.set("user:1", "v1")
+        cache.set("user:10", "v2")
+        cache.set("users", "v3")
+        cache.delete("user:1")
+        assert cache.keys("user:*") == ["user:10"]
+
+    def test_periodic_sweep_evicts_unread_expired_keys(self):
+        """Expired keys are evicted by the sweep without being read."""
+        cache = MockCache(cleanup_interval=2)
+        cache.set("stale", "v1", ttl=1)
+        cache.set("live", "v2")
+        # Simulate expiration in both the entry and its heap slot
+        expired_at = time.time() - 1
+        cache._store["test:stale"].expires_at = expired_at
+        cache._expiry_heap[0] = (expired_at, "test:stale")
+        cache.get("live")
+        cache.get("live")
+        assert "test:stale" not in cache._store
+
     def test_size_excludes_expired(self):
         """Size doesn't count expired entries."""
         cache = MockCache()
@@ -173,6 +224,18 @@ class TestMockCache:
         assert cache.get("user:1") is None
         assert cache.get("order:1") == "v3"
 
+    def test_tags_pruned_on_delete_and_overwrite(self):
+        """Deleted or re-tagged keys are not counted by delete_by_tag."""
+        cache = MockCache()
+        cache.set("user:1", "v1", tags=["users"])
+        cache.set("user:2", "v2", tags=["users"])
+        cache.set("user:3", "v3", tags=["users"])
+        cache.delete("user:1")
+        cache.set("user:2", "v2b", tags=["admins"])
+        assert cache.delete_by_tag("users") == 1
+        assert cache.get("user:2") == "v2b"
+        assert cache.delete_by_tag("admins") == 1
+
 
 # =============================================================================
 # MockJobQueue Tests
@@ -301,6 +364,31 @@ class TestMockJobQueue:
         assert count == 3
         assert results == [1, 2, 3]
 
+    def test_process_next_skips_delayed_head(self):
+        """A delayed job does not block jobs enqueued after it."""
+        queue = MockJobQueue()
+        queue.handler("test")(lambda p: p["n"])
+        queue.enqueue("test", {"n": 1}, delay_seconds=3600)
+        queue.enqueue("test", {"n": 2})
+        job = queue.process_next()
+        assert job.result == 2
+        assert queue.process_next() is None
+        assert [j.payload["n"] for j in queue.jobs] == [1]
+
+    def test_process_next_requeues_retry(self):
+        """A failed job with retries left stays pending until its backoff."""
+        queue = MockJobQueue()
+
+        @queue.handler("flaky")
+        def handle(payload):
+            raise ValueError("boom")
+
+        job = queue.enqueue("flaky", {}, max_attempts=3)
+        assert queue.process_next() is job
+        assert job.status == "pending"
+        assert queue.jobs == [job]
+        assert queue.process_next() is None
+
     def test_sync_mode_executes_immediately(self):
         """sync_mode=True executes jobs on enqueue."""
         queue = MockJobQueue(sync_mode=True)
@@ -325,6 +413,15 @@ class TestMockJobQueue:
         queue.enqueue("delayed", {}, delay_seconds=60)
         assert results == []
 
+    def test_sync_mode_queues_unhandled(self):
+        """sync_mode queues jobs whose handler is registered later."""
+        queue = MockJobQueue(sync_mode=True)
+        job = queue.enqueue("late", {})
+        assert job.status == "pending"
+        queue.handler("late")(lambda p: "done")
+        assert queue.process_all() == 1
+        assert job.result == "done"
+
     def test_jobs_property(self):
         """jobs property returns pending jobs only."""
         queue = MockJobQueue()
@@ -61,3 +61,21 @@ async def test_add_webhooks_registers_tick_and_handler():
     # Dependency override still returns the same outbox instance the handler will use
     outbox_override = app.dependency_overrides[router_module.get_outbox]
     assert outbox_override() is app.state.webhooks_outbox
+
+
+def test_add_webhooks_closes_delivery_client_on_shutdown(monkeypatch):
+    from svc_infra.jobs.builtins.webhook_delivery import WebhookDeliveryHandler
+
+    closed = []
+
+    async def fake_aclose(self):
+        closed.append(self)
+
+    monkeypatch.setattr(WebhookDeliveryHandler, "aclose", fake_aclose)
+
+    app = FastAPI()
+    add_webhooks(app, queue=InMemoryJobQueue())
+
+    with TestClient(app):
+        assert closed == []
+    assert closed == [app.state.webhooks_delivery_handler]
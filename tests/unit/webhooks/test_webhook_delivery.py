@@ -4,19 +4,26 @@ Tests for webhook delivery service.
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
-from unittest.mock import MagicMock
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from svc_infra.resilience.retry import RetryConfig
+from svc_infra.webhooks.service import (
+    InMemoryWebhookSubscriptions,
+    WebhookService,
+    WebhookSubscription,
+    _utc_now_iso,
+)
+from svc_infra.webhooks.signing import sign
+
 
 class TestWebhookSubscription:
     """Tests for WebhookSubscription dataclass."""
 
     def test_subscription_default_id(self):
         """Should generate UUID for id by default."""
-        from svc_infra.webhooks.service import WebhookSubscription
-
         sub = WebhookSubscription(topic="test", url="http://example.com", secret="s")
 
         assert sub.id is not None
@@ -24,16 +31,12 @@ class TestWebhookSubscription:
 
     def test_subscription_custom_id(self):
         """Should accept custom id."""
-        from svc_infra.webhooks.service import WebhookSubscription
-
         sub = WebhookSubscription(topic="test", url="http://example.com", secret="s", id="custom")
 
         assert sub.id == "custom"
 
     def test_subscription_fields(self):
         """Should store all fields correctly."""
-        from svc_infra.webhooks.service import WebhookSubscription
-
         sub = WebhookSubscription(
             topic="orders.created", url="https://webhook.example.com", secret="secret123"
         )
@@ -42,6 +45,12 @@ class TestWebhookSubscription:
         assert sub.url == "https://webhook.example.com"
         assert sub.secret == "secret123"
 
+    def test_subscription_has_no_instance_dict(self):
+        """Should use slots so large subscription tables stay compact."""
+        sub = WebhookSubscription(topic="test", url="http://example.com", secret="s")
+
+        assert not hasattr(sub, "__dict__")
+
 
 class TestInMemoryWebhookSubscriptions:
     """Tests for in-memory subscription store."""
@@ -49,8 +58,6 @@ class TestInMemoryWebhookSubscriptions:
     @pytest.fixture
     def subs(self):
         """Create fresh subscription store."""
-        from svc_infra.webhooks.service import InMemoryWebhookSubscriptions
-
         return InMemoryWebhookSubscriptions()
 
     def test_add_subscription(self, subs):
@@ -73,19 +80,21 @@ class TestInMemoryWebhookSubscriptions:
         assert len(result) == 2
 
     def test_get_for_topic_empty(self, subs):
-        """Should return empty list for unknown topic."""
+        """Should return empty tuple for unknown topic."""
         result = subs.get_for_topic("unknown")
 
-        assert result == []
+        assert result == ()
 
-    def test_get_for_topic_returns_copy(self, subs):
-        """Should return copy, not reference."""
-        subs.add("topic", "http://example.com", "secret")
+    def test_get_for_topic_returns_snapshot(self, subs):
+        """Should return a snapshot unaffected by later adds."""
+        subs.add("topic", "http://example1.com", "secret")
 
-        result1 = subs.get_for_topic("topic")
-        result2 = subs.get_for_topic("topic")
+        snapshot = subs.get_for_topic("topic")
+        subs.add("topic", "http://example2.com", "secret")
 
-        assert result1 is not result2
+        assert isinstance(snapshot, tuple)
+        assert len(snapshot) == 1
+        assert len(subs.get_for_topic("topic")) == 2
 
     def test_upsert_same_url_updates_secret(self, subs):
         """Should update secret for same topic+url."""
@@ -109,61 +118,91 @@ class TestInMemoryWebhookSubscriptions:
         assert len(result2) == 1
 
 
+@dataclass
+class _StubMsg:
+    id: int
+
+
+class _StubOutbox:
+    """Outbox stand-in that records enqueue calls and returns sequential ids."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+
+    def enqueue(self, topic: str, payload: dict) -> _StubMsg:
+        self.calls.append((topic, payload))
+        return _StubMsg(id=len(self.calls))
+
+
 class TestWebhookService:
     """Tests for WebhookService."""
 
     @pytest.fixture
-    def mock_outbox(self, mocker):
-        """Create mock outbox store."""
-        outbox = mocker.Mock()
-        msg = mocker.Mock()
-        msg.id = 1
-        outbox.enqueue = mocker.Mock(return_value=msg)
-        return outbox
+    def outbox(self):
+        """Create stub outbox store."""
+        return _StubOutbox()
 
     @pytest.fixture
     def subs(self):
         """Create subscription store."""
-        from svc_infra.webhooks.service import InMemoryWebhookSubscriptions
-
         return InMemoryWebhookSubscriptions()
 
     @pytest.fixture
-    def service(self, mock_outbox, subs):
+    def service(self, outbox, subs):
         """Create webhook service."""
-        from svc_infra.webhooks.service import WebhookService
-
-        return WebhookService(mock_outbox, subs)
+        return WebhookService(outbox, subs)
 
-    def test_publish_no_subscribers(self, service, mock_outbox):
+    def test_publish_no_subscribers(self, service, outbox):
         """Should not enqueue if no subscribers."""
         service.publish("topic", {"data": "value"})
 
-        mock_outbox.enqueue.assert_not_called()
+        assert outbox.calls == []
 
-    def test_publish_single_subscriber(self, service, subs, mock_outbox):
+    def test_publish_single_subscriber(self, service, subs, outbox):
         """Should enqueue for single subscriber."""
         subs.add("topic", "http://example.com", "secret")
 
         service.publish("topic", {"data": "value"})
 
-        mock_outbox.enqueue.assert_called_once()
+        assert len(outbox.calls) == 1
 
-    def test_publish_multiple_subscribers(self, service, subs, mock_outbox):
+    def test_publish_multiple_subscribers(self, service, subs, outbox):
         """Should enqueue for all subscribers."""
         subs.add("topic", "http://example1.com", "secret1")
         subs.add("topic", "http://example2.com", "secret2")
 
         service.publish("topic", {"data": "value"})
 
-        assert mock_outbox.enqueue.call_count == 2
+        assert len(outbox.calls) == 2
 
-    def test_publish_returns_last_message_id(self, service, subs, mock_outbox):
-        """Should return last message id."""
-        msg1 = MagicMock(id=1)
-        msg2 = MagicMock(id=2)
-        mock_outbox.enqueue.side_effect = [msg1, msg2]
+    def test_publish_copies_event_per_subscriber(self, service, subs, outbox):
+        """Should give each subscriber's message its own, equal event dict."""
+        subs.add("topic", "http://example1.com", "secret1")
+        subs.add("topic", "http://example2.com", "secret2")
 
+        service.publish("topic", {"data": "value"})
+
+        first, second = (payload for _, payload in outbox.calls)
+        assert first["event"] == second["event"]
+        assert first["event"] is not second["event"]
+        first["event"]["version"] = 99
+        assert second["event"]["version"] == 1
+        assert first["subscription"]["url"] != second["subscription"]["url"]
+
+    def test_publish_subscription_block_not_shared(self, service, subs, outbox):
+        """Mutating one message's subscription block should not leak into later ones."""
+        subs.add("topic", "http://example.com", "secret")
+
+        service.publish("topic", {"data": "value"})
+        service.publish("topic", {"data": "value"})
+
+        first, second = (payload for _, payload in outbox.calls)
+        assert first["subscription"] is not second["subscription"]
+        first["subscription"]["url"] = "http://tampered.example.com"
+        assert second["subscription"]["url"] == "http://example.com"
+
+    def test_publish_returns_last_message_id(self, service, subs, outbox):
+        """Should return last message id."""
         subs.add("topic", "http://example1.com", "secret1")
         subs.add("topic", "http://example2.com", "secret2")
 
@@ -171,58 +210,85 @@ class TestWebhookService:
 
         assert result == 2
 
-    def test_publish_includes_event_metadata(self, service, subs, mock_outbox):
+    def test_publish_includes_event_metadata(self, service, subs, outbox):
         """Should include event metadata in payload."""
         subs.add("topic", "http://example.com", "secret")
 
         service.publish("topic", {"data": "value"}, version=2)
 
-        call_args = mock_outbox.enqueue.call_args
-        payload = call_args[0][1]
+        _, payload = outbox.calls[-1]
 
         assert payload["event"]["topic"] == "topic"
         assert payload["event"]["version"] == 2
         assert "created_at" in payload["event"]
 
-    def test_publish_includes_subscription_info(self, service, subs, mock_outbox):
+    def test_publish_includes_subscription_info(self, service, subs, outbox):
         """Should include subscription info in payload."""
         subs.add("topic", "http://example.com", "secret")
 
         service.publish("topic", {"data": "value"})
 
-        call_args = mock_outbox.enqueue.call_args
-        payload = call_args[0][1]
+        _, payload = outbox.calls[-1]
 
         assert "subscription" in payload
         assert payload["subscription"]["url"] == "http://example.com"
         assert payload["subscription"]["topic"] == "topic"
 
-    def test_publish_encrypts_secret(self, service, subs, mock_outbox, mocker):
+    def test_publish_encrypts_secret(self, service, subs, outbox, mocker):
         """Should encrypt secret before storing."""
         mocker.patch("svc_infra.webhooks.service.encrypt_secret", return_value="enc:v1:encrypted")
         subs.add("topic", "http://example.com", "plaintext_secret")
 
         service.publish("topic", {"data": "value"})
 
-        call_args = mock_outbox.enqueue.call_args
-        payload = call_args[0][1]
+        _, payload = outbox.calls[-1]
 
         assert payload["subscription"]["secret"] == "enc:v1:encrypted"
 
+    def test_publish_reuses_secret_encrypted_at_add(self, service, subs, outbox, mocker):
+        """Should encrypt once per add or rotation, not once per publish."""
+        encrypt = mocker.patch(
+            "svc_infra.webhooks.service.encrypt_secret", side_effect=lambda s: f"enc:v1:{s}"
+        )
+        subs.add("topic", "http://example.com", "secret1")
+
+        service.publish("topic", {"n": 1})
+        service.publish("topic", {"n": 2})
+        assert encrypt.call_count == 1
+
+        subs.add("topic", "http://example.com", "secret2")
+        service.publish("topic", {"n": 3})
+
+        assert encrypt.call_count == 2
+        _, payload = outbox.calls[-1]
+        assert payload["subscription"]["secret"] == "enc:v1:secret2"
+
+    def test_publish_subscription_block_tracks_changes(self, service, subs, outbox):
+        """Should build equal but separate blocks that reflect subscription changes."""
+        subs.add("topic", "http://example.com", "secret1")
+
+        service.publish("topic", {"n": 1})
+        service.publish("topic", {"n": 2})
+        (sub,) = subs.get_for_topic("topic")
+        sub.url = "http://example.org"
+        service.publish("topic", {"n": 3})
+
+        first, second, third = (payload["subscription"] for _, payload in outbox.calls)
+        assert first == second
+        assert first is not second
+        assert third["url"] == "http://example.org"
+
 
 class TestWebhookDeliveryRetry:
     """Tests for webhook delivery retry logic."""
 
     def test_exponential_backoff_calculation(self):
         """Should calculate exponential backoff correctly."""
-        # Typical backoff: 1, 2, 4, 8, 16, 32 seconds
-        base = 1
-        max_delay = 60
+        config = RetryConfig(base_delay=1, max_delay=60, jitter=0)
 
-        for attempt in range(6):
-            delay = min(base * (2**attempt), max_delay)
-            expected = [1, 2, 4, 8, 16, 32][attempt]
-            assert delay == expected
+        delays = [config.calculate_delay(attempt) for attempt in range(1, 8)]
+
+        assert delays == [1, 2, 4, 8, 16, 32, 60]
 
     def test_max_retries_limit(self):
         """Should respect max retries limit."""
@@ -252,10 +318,10 @@ class TestWebhookEventPayload:
 
     def test_event_includes_created_at(self):
         """Should include ISO timestamp."""
-        created_at = datetime.now(UTC).isoformat()
+        created_at = _utc_now_iso()
 
-        assert "T" in created_at
-        assert created_at.endswith("+00:00") or created_at.endswith("Z")
+        assert created_at.endswith("+00:00")
+        assert abs(datetime.fromisoformat(created_at) - datetime.now(UTC)) < timedelta(seconds=5)
 
     def test_event_includes_version(self):
         """Should include version number."""
@@ -276,8 +342,6 @@ class TestWebhookHTTPDelivery:
     @pytest.mark.asyncio
     async def test_delivery_with_signature_header(self, mocker):
         """Should include signature in header."""
-        from svc_infra.webhooks.signing import sign
-
         payload = {"data": "value"}
         secret = "secret"
         signature = sign(secret, payload)
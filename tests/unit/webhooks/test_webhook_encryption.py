@@ -4,48 +4,62 @@ Tests for webhook secret encryption.
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import os
 
 import pytest
 
+from svc_infra.webhooks.encryption import (
+    _get_encryption_key,
+    _get_fernet,
+    decrypt_secret,
+    encrypt_many,
+    encrypt_secret,
+    is_encrypted,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fernet_env():
+    """Derive the default test-key Fernet once for the whole module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("WEBHOOK_ENCRYPTION_KEY", "test-key")
+        _get_fernet.cache_clear()
+        yield
+    _get_fernet.cache_clear()
 
-class TestEncryptSecret:
-    """Tests for secret encryption."""
 
-    def test_encrypt_returns_prefixed_string(self, mocker):
-        """Should return string with enc:v1: prefix."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
+@contextlib.contextmanager
+def with_key(key: str):
+    """Encrypt with a non-default key, restoring the default cipher on exit."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("WEBHOOK_ENCRYPTION_KEY", key)
+        _get_fernet.cache_clear()
+        try:
+            yield
+        finally:
+            _get_fernet.cache_clear()
 
-        from svc_infra.webhooks.encryption import _get_fernet, encrypt_secret
 
-        # Clear the cache
-        _get_fernet.cache_clear()
+class TestEncryptSecret:
+    """Tests for secret encryption."""
 
+    def test_encrypt_returns_prefixed_string(self):
+        """Should return string with enc:v1: prefix."""
         result = encrypt_secret("my_secret")
 
         assert result.startswith("enc:v1:")
 
-    def test_encrypt_different_inputs_different_outputs(self, mocker):
+    def test_encrypt_different_inputs_different_outputs(self):
         """Should produce different ciphertext for different inputs."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         result1 = encrypt_secret("secret1")
         result2 = encrypt_secret("secret2")
 
         assert result1 != result2
 
-    def test_encrypt_same_input_different_outputs(self, mocker):
+    def test_encrypt_same_input_different_outputs(self):
         """Should produce different ciphertext each time (due to IV)."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         result1 = encrypt_secret("same_secret")
         result2 = encrypt_secret("same_secret")
 
@@ -56,40 +70,22 @@ class TestEncryptSecret:
 class TestDecryptSecret:
     """Tests for secret decryption."""
 
-    def test_decrypt_encrypted_value(self, mocker):
+    def test_decrypt_encrypted_value(self):
         """Should decrypt encrypted value correctly."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         original = "my_secret_value"
         encrypted = encrypt_secret(original)
         decrypted = decrypt_secret(encrypted)
 
         assert decrypted == original
 
-    def test_decrypt_unencrypted_value(self, mocker):
+    def test_decrypt_unencrypted_value(self):
         """Should return unencrypted value as-is."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret
-
-        _get_fernet.cache_clear()
-
         result = decrypt_secret("plain_text_value")
 
         assert result == "plain_text_value"
 
-    def test_decrypt_empty_string(self, mocker):
+    def test_decrypt_empty_string(self):
         """Should handle empty string."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret
-
-        _get_fernet.cache_clear()
-
         result = decrypt_secret("")
 
         assert result == ""
@@ -100,26 +96,18 @@ class TestIsEncrypted:
 
     def test_is_encrypted_with_prefix(self):
         """Should return True for prefixed values."""
-        from svc_infra.webhooks.encryption import is_encrypted
-
         assert is_encrypted("enc:v1:some_encrypted_data") is True
 
     def test_is_encrypted_without_prefix(self):
         """Should return False for non-prefixed values."""
-        from svc_infra.webhooks.encryption import is_encrypted
-
         assert is_encrypted("plain_text") is False
 
     def test_is_encrypted_empty_string(self):
         """Should return False for empty string."""
-        from svc_infra.webhooks.encryption import is_encrypted
-
         assert is_encrypted("") is False
 
     def test_is_encrypted_partial_prefix(self):
         """Should return False for partial prefix."""
-        from svc_infra.webhooks.encryption import is_encrypted
-
         assert is_encrypted("enc:") is False
         assert is_encrypted("enc:v1") is False
 
@@ -131,8 +119,6 @@ class TestGetEncryptionKey:
         """Should read key from environment."""
         mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "my-test-key"})
 
-        from svc_infra.webhooks.encryption import _get_encryption_key
-
         key = _get_encryption_key()
 
         assert key is not None
@@ -146,18 +132,23 @@ class TestGetEncryptionKey:
         valid_key = Fernet.generate_key().decode()
         mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": valid_key})
 
-        from svc_infra.webhooks.encryption import _get_encryption_key
-
         key = _get_encryption_key()
 
         assert len(key) == 32
 
+    def test_fernet_shaped_invalid_key_derived(self, mocker):
+        """Should derive a key when a 44-char value is not valid base64 of 32 bytes."""
+        not_a_key = "!" * 43 + "="
+        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": not_a_key})
+
+        key = _get_encryption_key()
+
+        assert key == hashlib.sha256(not_a_key.encode()).digest()
+
     def test_arbitrary_string_derived(self, mocker):
         """Should derive key from arbitrary string."""
         mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "short"})
 
-        from svc_infra.webhooks.encryption import _get_encryption_key
-
         key = _get_encryption_key()
 
         # SHA256 always produces 32 bytes
@@ -167,27 +158,15 @@ class TestGetEncryptionKey:
 class TestGetFernet:
     """Tests for Fernet cipher management."""
 
-    def test_fernet_cached(self, mocker):
+    def test_fernet_cached(self):
         """Should cache Fernet instance."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet
-
-        _get_fernet.cache_clear()
-
         fernet1 = _get_fernet()
         fernet2 = _get_fernet()
 
         assert fernet1 is fernet2
 
-    def test_fernet_not_none_with_cryptography(self, mocker):
+    def test_fernet_not_none_with_cryptography(self):
         """Should return Fernet instance when cryptography installed."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet
-
-        _get_fernet.cache_clear()
-
         fernet = _get_fernet()
 
         assert fernet is not None
@@ -196,56 +175,32 @@ class TestGetFernet:
 class TestEncryptionRoundTrip:
     """Tests for complete encrypt/decrypt cycle."""
 
-    def test_roundtrip_ascii(self, mocker):
+    def test_roundtrip_ascii(self):
         """Should roundtrip ASCII text."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         original = "hello_world_123"
         encrypted = encrypt_secret(original)
         decrypted = decrypt_secret(encrypted)
 
         assert decrypted == original
 
-    def test_roundtrip_unicode(self, mocker):
+    def test_roundtrip_unicode(self):
         """Should roundtrip unicode text."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         original = "hello world 123"
         encrypted = encrypt_secret(original)
         decrypted = decrypt_secret(encrypted)
 
         assert decrypted == original
 
-    def test_roundtrip_special_characters(self, mocker):
+    def test_roundtrip_special_characters(self):
         """Should roundtrip special characters."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         original = "!@#$%^&*()_+-=[]{}|;':\",./<>?"
         encrypted = encrypt_secret(original)
         decrypted = decrypt_secret(encrypted)
 
         assert decrypted == original
 
-    def test_roundtrip_long_secret(self, mocker):
+    def test_roundtrip_long_secret(self):
         """Should roundtrip long secrets."""
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         original = "x" * 1000
         encrypted = encrypt_secret(original)
         decrypted = decrypt_secret(encrypted)
@@ -253,40 +208,40 @@ class TestEncryptionRoundTrip:
         assert decrypted == original
 
 
-class TestEncryptionSecurity:
-    """Tests for encryption security properties."""
+class TestEncryptMany:
+    """Tests for batch encryption."""
 
-    def test_different_keys_cannot_decrypt(self, mocker):
-        """Should fail to decrypt with different key."""
-        from cryptography.fernet import InvalidToken
+    def test_encrypt_many_matches_single(self):
+        """Should decrypt to the inputs, in order, like encrypt_secret."""
+        originals = ["alpha", "beta", "x" * 1000]
 
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "key1"})
+        encrypted = encrypt_many(originals)
 
-        from svc_infra.webhooks.encryption import _get_fernet, encrypt_secret
+        assert all(is_encrypted(value) for value in encrypted)
+        assert [decrypt_secret(value) for value in encrypted] == originals
 
-        _get_fernet.cache_clear()
+    def test_encrypt_many_empty(self):
+        """Should return an empty list for no inputs."""
+        assert encrypt_many([]) == []
 
-        encrypted = encrypt_secret("secret")
 
-        # Change the key
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "key2"})
-        _get_fernet.cache_clear()
+class TestEncryptionSecurity:
+    """Tests for encryption security properties."""
+
+    def test_different_keys_cannot_decrypt(self):
+        """Should fail to decrypt with different key."""
+        from cryptography.fernet import InvalidToken
 
-        from svc_infra.webhooks.encryption import decrypt_secret
+        with with_key("key1"):
+            encrypted = encrypt_secret("secret")
 
-        with pytest.raises(InvalidToken):
+        with with_key("key2"), pytest.raises(InvalidToken):
             decrypt_secret(encrypted)
 
-    def test_tampered_ciphertext_fails(self, mocker):
+    def test_tampered_ciphertext_fails(self):
         """Should fail on tampered ciphertext."""
         from cryptography.fernet import InvalidToken
 
-        mocker.patch.dict(os.environ, {"WEBHOOK_ENCRYPTION_KEY": "test-key"})
-
-        from svc_infra.webhooks.encryption import _get_fernet, decrypt_secret, encrypt_secret
-
-        _get_fernet.cache_clear()
-
         encrypted = encrypt_secret("secret")
 
         # Tamper with the ciphertext
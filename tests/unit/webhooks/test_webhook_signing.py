@@ -117,6 +117,57 @@ class TestSign:
 
         assert signature == expected
 
+    def test_sign_long_secret_matches_hmac(self):
+        """Should hash secrets longer than the SHA-256 block size, like hmac."""
+        from svc_infra.webhooks.signing import canonical_body, sign
+
+        secret = "s" * 100
+        payload = {"key": "value"}
+        expected = hmac.new(secret.encode(), canonical_body(payload), hashlib.sha256).hexdigest()
+
+        assert sign(secret, payload) == expected
+        # Second call is served from the cached HMAC template
+        assert sign(secret, payload) == expected
+
+    def test_sign_does_not_mutate_cached_template(self):
+        """Should copy the cached HMAC so one signature does not leak into the next."""
+        from svc_infra.webhooks.signing import sign
+
+        first = sign("secret", {"a": 1})
+        sign("secret", {"b": 2})
+
+        assert sign("secret", {"a": 1}) == first
+
+    def test_hmac_cache_is_not_keyed_by_plaintext_secret(self):
+        """Should key cached HMAC objects by a digest, never by the secret itself."""
+        from svc_infra.webhooks import signing
+
+        secret = "plaintext-webhook-secret"
+        signing.sign(secret, {"key": "value"})
+
+        assert secret not in signing._hmac_cache
+        assert all(isinstance(k, bytes) and secret.encode() not in k for k in signing._hmac_cache)
+
+    def test_hmac_cache_is_bounded(self, monkeypatch):
+        """Should evict the least recently used secret beyond the cache size."""
+        from svc_infra.webhooks import signing
+
+        monkeypatch.setattr(signing, "_HMAC_CACHE_MAXSIZE", 2)
+        signing._hmac_cache.clear()
+        for secret in ("s1", "s2", "s3"):
+            signing.sign(secret, {"key": "value"})
+
+        assert len(signing._hmac_cache) == 2
+        assert signing._key_id("s1") not in signing._hmac_cache
+
+    def test_sign_body_matches_sign(self):
+        """Should sign pre-encoded canonical bytes exactly like sign()."""
+        from svc_infra.webhooks.signing import canonical_body, sign, sign_body
+
+        payload = {"b": 2, "a": [1, {"z": None}]}
+
+        assert sign_body("secret", canonical_body(payload)) == sign("secret", payload)
+
 
 class TestVerify:
     """Tests for signature verification."""
@@ -174,6 +225,48 @@ class TestVerify:
 
         assert result is False
 
+    def test_verify_rejects_uppercase_signature(self):
+        """Should only accept the lowercase hex form that sign() produces."""
+        from svc_infra.webhooks.signing import sign, verify, verify_any
+
+        payload = {"key": "value"}
+        signature = sign("secret", payload).upper()
+
+        assert verify("secret", payload, signature) is False
+        assert verify_any(["secret"], payload, signature) is False
+
+    def test_verify_rejects_whitespace_in_signature(self):
+        """Should reject padded or spaced signatures that bytes.fromhex would accept."""
+        from svc_infra.webhooks.signing import sign, verify, verify_any
+
+        payload = {"key": "value"}
+        signature = sign("secret", payload)
+        padded = f" {signature} "
+        spaced = f"{signature[:32]} {signature[33:]}"
+
+        for candidate in (padded, spaced):
+            assert verify("secret", payload, candidate) is False
+            assert verify_any(["secret"], payload, candidate) is False
+
+
+class TestSignMany:
+    """Tests for signing one payload with several secrets."""
+
+    def test_sign_many_matches_sign(self):
+        """Should produce the same signatures as sign() per secret."""
+        from svc_infra.webhooks.signing import sign, sign_many
+
+        payload = {"event": "test", "data": {"id": 1}}
+        secrets = ["secret1", "secret2", "x" * 100]
+
+        assert sign_many(secrets, payload) == [sign(s, payload) for s in secrets]
+
+    def test_sign_many_empty_secrets(self):
+        """Should return an empty list when no secrets are given."""
+        from svc_infra.webhooks.signing import sign_many
+
+        assert sign_many([], {"key": "value"}) == []
+
 
 class TestVerifyAny:
     """Tests for multi-secret verification."""
@@ -211,6 +304,23 @@ class TestVerifyAny:
 
         assert verify_any([], {"key": "value"}, "signature") is False
 
+    def test_verify_any_malformed_signature(self):
+        """Should return False without raising for a non-hex signature."""
+        from svc_infra.webhooks.signing import verify_any
+
+        assert verify_any(["secret1", "secret2"], {"key": "value"}, "not-hex!") is False
+
+    def test_verify_any_encodes_body_once(self, mocker):
+        """Should serialize the payload once regardless of secret count."""
+        from svc_infra.webhooks import signing
+
+        payload = {"key": "value"}
+        signature = signing.sign("secret3", payload)
+        spy = mocker.spy(signing, "canonical_body")
+
+        assert signing.verify_any(["secret1", "secret2", "secret3"], payload, signature)
+        assert spy.call_count == 1
+
     def test_verify_any_secret_rotation(self):
         """Should support secret rotation with old and new secrets."""
         from svc_infra.webhooks.signing import sign, verify_any
@@ -11,6 +11,19 @@ from svc_infra.db.inbox import InMemoryInboxStore
 from svc_infra.db.outbox import InMemoryOutboxStore
 
 
+def _serve_hash(client: MagicMock, fields: dict[bytes, bytes]) -> None:
+    """Serve direct and pipelined hmget calls on a mock client from one Redis hash dict."""
+
+    def hmget(key: str, *names: str) -> list[bytes | None]:
+        return [fields.get(name.encode()) for name in names]
+
+    queued: list[list[bytes | None]] = []
+    client.hmget.side_effect = hmget
+    pipe = client.pipeline.return_value
+    pipe.hmget.side_effect = lambda key, *names: queued.append(hmget(key, *names))
+    pipe.execute.side_effect = lambda: [queued.pop(0) for _ in range(len(queued))]
+
+
 class TestRedisOutboxStore:
     """Tests for RedisOutboxStore class."""
 
@@ -27,8 +40,25 @@ class TestRedisOutboxStore:
         assert msg.id == 1
         assert msg.topic == "order.created"
         assert msg.payload == {"order_id": 123}
-        mock_client.hset.assert_called_once()
-        mock_client.rpush.assert_called_once()
+        pipe = mock_client.pipeline.return_value
+        pipe.hset.assert_called_once()
+        pipe.rpush.assert_called_once()
+        pipe.execute.assert_called_once()
+
+    def test_enqueue_stores_json_module_payload(self) -> None:
+        """Test enqueue writes the payload with the json module, whatever is installed."""
+        import json
+
+        from svc_infra.webhooks.add import RedisOutboxStore
+
+        mock_client = MagicMock()
+        mock_client.incr.return_value = 1
+        payload = {"name": "café", "ratio": float("nan")}
+
+        RedisOutboxStore(mock_client).enqueue("metrics", payload)
+
+        record = mock_client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+        assert record["payload"] == json.dumps(payload)
 
     def test_enqueue_handles_non_int_incr_result(self) -> None:
         """Test enqueue handles non-integer incr result."""
@@ -43,20 +73,75 @@ class TestRedisOutboxStore:
         # Should fallback to 0
         assert msg.id == 0
 
+    def test_enqueue_fetch_roundtrip(self) -> None:
+        """Test enqueued messages can be fetched back from Redis."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from svc_infra.webhooks.add import RedisOutboxStore
+
+        store = RedisOutboxStore(fakeredis.FakeRedis())
+        first = store.enqueue("order.created", {"order_id": 1})
+        store.enqueue("order.created", {"order_id": 2})
+
+        msg = store.fetch_next()
+        assert msg is not None
+        assert msg.id == first.id
+        assert msg.payload == {"order_id": 1}
+
+    def test_fetch_next_decodes_json_module_payloads(self) -> None:
+        """Test fetch_next reads payloads that only the json module accepts."""
+        from svc_infra.webhooks.add import RedisOutboxStore
+
+        mock_client = MagicMock()
+        mock_client.lrange.return_value = [b"1"]
+        _serve_hash(
+            mock_client,
+            {
+                b"topic": b"metrics",
+                b"payload": b'{"ratio": NaN, "name": "caf\\u00e9"}',
+                b"attempts": b"0",
+                b"processed_at": b"",
+            },
+        )
+
+        store = RedisOutboxStore(mock_client)
+        msg = store.fetch_next()
+
+        assert msg is not None
+        assert msg.payload["name"] == "café"
+        assert msg.payload["ratio"] != msg.payload["ratio"]  # NaN
+
+    def test_fetch_next_scans_past_first_window(self) -> None:
+        """Test fetch_next finds a pending message behind a window of processed ones."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from svc_infra.webhooks.add import _FETCH_WINDOW, RedisOutboxStore
+
+        store = RedisOutboxStore(fakeredis.FakeRedis())
+        for i in range(_FETCH_WINDOW + 2):
+            msg = store.enqueue("order.created", {"order_id": i})
+            if i <= _FETCH_WINDOW:
+                store.mark_processed(msg.id)
+
+        pending = store.fetch_next()
+        assert pending is not None
+        assert pending.payload == {"order_id": _FETCH_WINDOW + 1}
+
     def test_fetch_next_returns_unprocessed_message(self) -> None:
         """Test fetch_next returns unprocessed message."""
         from svc_infra.webhooks.add import RedisOutboxStore
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {
-            b"id": b"1",
-            b"topic": b"order.created",
-            b"payload": b'{"order_id": 123}',
-            b"created_at": b"2024-01-01T00:00:00+00:00",
-            b"attempts": b"0",
-            b"processed_at": b"",
-        }
+        _serve_hash(
+            mock_client,
+            {
+                b"id": b"1",
+                b"topic": b"order.created",
+                b"payload": b'{"order_id": 123}',
+                b"created_at": b"2024-01-01T00:00:00+00:00",
+                b"attempts": b"0",
+                b"processed_at": b"",
+            },
+        )
 
         store = RedisOutboxStore(mock_client)
         msg = store.fetch_next()
@@ -71,14 +156,17 @@ class TestRedisOutboxStore:
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {
-            b"id": b"1",
-            b"topic": b"order.created",
-            b"payload": b"{}",
-            b"created_at": b"2024-01-01T00:00:00+00:00",
-            b"attempts": b"0",
-            b"processed_at": b"2024-01-01T01:00:00+00:00",
-        }
+        _serve_hash(
+            mock_client,
+            {
+                b"id": b"1",
+                b"topic": b"order.created",
+                b"payload": b"{}",
+                b"created_at": b"2024-01-01T00:00:00+00:00",
+                b"attempts": b"0",
+                b"processed_at": b"2024-01-01T01:00:00+00:00",
+            },
+        )
 
         store = RedisOutboxStore(mock_client)
         msg = store.fetch_next()
@@ -91,14 +179,17 @@ class TestRedisOutboxStore:
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {
-            b"id": b"1",
-            b"topic": b"order.created",
-            b"payload": b"{}",
-            b"created_at": b"",
-            b"attempts": b"1",
-            b"processed_at": b"",
-        }
+        _serve_hash(
+            mock_client,
+            {
+                b"id": b"1",
+                b"topic": b"order.created",
+                b"payload": b"{}",
+                b"created_at": b"",
+                b"attempts": b"1",
+                b"processed_at": b"",
+            },
+        )
 
         store = RedisOutboxStore(mock_client)
         msg = store.fetch_next()
@@ -111,14 +202,17 @@ class TestRedisOutboxStore:
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {
-            b"id": b"1",
-            b"topic": b"order.created",
-            b"payload": b"{}",
-            b"created_at": b"",
-            b"attempts": b"0",
-            b"processed_at": b"",
-        }
+        _serve_hash(
+            mock_client,
+            {
+                b"id": b"1",
+                b"topic": b"order.created",
+                b"payload": b"{}",
+                b"created_at": b"",
+                b"attempts": b"0",
+                b"processed_at": b"",
+            },
+        )
 
         store = RedisOutboxStore(mock_client)
         # Request only user.created topic
@@ -126,6 +220,30 @@ class TestRedisOutboxStore:
 
         assert msg is None
 
+    def test_fetch_next_skips_payload_read_for_filtered(self) -> None:
+        """Test fetch_next does not read the payload of skipped messages."""
+        from svc_infra.webhooks.add import RedisOutboxStore
+
+        mock_client = MagicMock()
+        mock_client.lrange.return_value = [b"1"]
+        _serve_hash(
+            mock_client,
+            {
+                b"topic": b"order.created",
+                b"payload": b'{"big": "payload"}',
+                b"attempts": b"0",
+                b"processed_at": b"2024-01-01T01:00:00+00:00",
+            },
+        )
+
+        store = RedisOutboxStore(mock_client)
+
+        assert store.fetch_next() is None
+        mock_client.pipeline.return_value.hmget.assert_called_once_with(
+            "webhooks:outbox:msg:1", "topic", "attempts", "processed_at"
+        )
+        mock_client.hmget.assert_not_called()
+
     def test_fetch_next_returns_none_for_empty_queue(self) -> None:
         """Test fetch_next returns None for empty queue."""
         from svc_infra.webhooks.add import RedisOutboxStore
@@ -144,7 +262,7 @@ class TestRedisOutboxStore:
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {}
+        _serve_hash(mock_client, {})
 
         store = RedisOutboxStore(mock_client)
         msg = store.fetch_next()
@@ -157,10 +275,13 @@ class TestRedisOutboxStore:
 
         mock_client = MagicMock()
         mock_client.lrange.return_value = [b"1"]
-        mock_client.hgetall.return_value = {
-            b"id": b"1",
-            b"payload": b"{}",
-        }
+        _serve_hash(
+            mock_client,
+            {
+                b"id": b"1",
+                b"payload": b"{}",
+            },
+        )
 
         store = RedisOutboxStore(mock_client)
         msg = store.fetch_next()
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from svc_infra.db.inbox import InMemoryInboxStore
@@ -93,8 +95,8 @@ async def test_webhooks_e2e_publish_to_delivery_retry(monkeypatch):
         async def __aexit__(self, *a):
             return False
 
-        async def post(self, url, json=None, headers=None):
-            return await fake_post(url, json=json, headers=headers)
+        async def post(self, url, content=None, headers=None):
+            return await fake_post(url, json=json.loads(content), headers=headers)
 
     monkeypatch.setattr(httpx, "AsyncClient", DummyClient)
 
@@ -118,7 +120,8 @@ async def test_webhooks_e2e_publish_to_delivery_retry(monkeypatch):
     assert ok2 is True
 
     # Verify outbox processed
-    msg = next(m for m in outbox._messages if m.id == outbox_id)
+    msg = outbox.get(outbox_id)
+    assert msg is not None
     assert msg.processed_at is not None
     # Verify we had exactly two HTTP calls
     assert flaky.calls == 2
@@ -304,6 +304,35 @@ class TestWebSocketClientConfig:
         assert client.config.open_timeout == 10.0
         assert client.config.ping_interval == 20.0
 
+    def test_default_config_is_cached_per_environment(self, monkeypatch):
+        """Default config is parsed once per set of WS_* values and follows env changes."""
+        from svc_infra.websocket.config import _load_default_config
+
+        _load_default_config.cache_clear()
+        monkeypatch.setenv("WS_OPEN_TIMEOUT", "5")
+        try:
+            first = WebSocketClient("wss://example.com/a")
+            second = WebSocketClient("wss://example.com/b")
+            assert _load_default_config.cache_info().misses == 1
+            assert second.config.open_timeout == 5.0
+
+            monkeypatch.setenv("WS_OPEN_TIMEOUT", "7")
+            third = WebSocketClient("wss://example.com/c")
+            assert third.config.open_timeout == 7.0
+            assert first.config.open_timeout == 5.0
+        finally:
+            _load_default_config.cache_clear()
+
+    def test_default_config_is_not_shared(self):
+        """Changing one client's default config does not change later defaults."""
+        first = WebSocketClient("wss://example.com/a")
+        assert first.config.max_queue_size == 16
+        first.config.max_queue_size = 1
+
+        second = WebSocketClient("wss://example.com/b")
+        assert second.config is not first.config
+        assert second.config.max_queue_size == 16
+
     def test_custom_config_overrides_defaults(self):
         """Custom config overrides defaults."""
         config = WebSocketConfig(
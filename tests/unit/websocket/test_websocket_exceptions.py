@@ -25,20 +25,19 @@ class TestWebSocketError:
         with pytest.raises(WebSocketError):
             raise WebSocketError("test error")
 
-    def test_message_is_preserved(self) -> None:
-        """Should preserve error message."""
-        error = WebSocketError("test message")
-        assert str(error) == "test message"
-
-    def test_empty_message(self) -> None:
-        """Should handle empty message."""
-        error = WebSocketError("")
-        assert str(error) == ""
-
-    def test_no_args(self) -> None:
-        """Should handle no arguments."""
-        error = WebSocketError()
-        assert str(error) == ""
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            (("test message",), "test message"),
+            (("",), ""),
+            ((), ""),
+        ],
+        ids=["message", "empty", "no_args"],
+    )
+    def test_message_is_preserved(self, args: tuple[str, ...], expected: str) -> None:
+        """Should preserve the message, including empty and missing ones."""
+        error = WebSocketError(*args)
+        assert str(error) == expected
 
 
 class TestConnectionClosedError:
@@ -108,73 +107,36 @@ class TestConnectionClosedError:
         assert error.code == 1006
 
 
-class TestConnectionFailedError:
-    """Tests for ConnectionFailedError exception."""
-
-    def test_inherits_websocket_error(self) -> None:
-        """Should inherit from WebSocketError."""
-        assert issubclass(ConnectionFailedError, WebSocketError)
-
-    def test_can_be_raised(self) -> None:
-        """Should be raisable."""
-        with pytest.raises(ConnectionFailedError):
-            raise ConnectionFailedError("Failed to connect")
-
-    def test_message_is_preserved(self) -> None:
-        """Should preserve error message."""
-        error = ConnectionFailedError("Connection refused")
-        assert str(error) == "Connection refused"
-
-    def test_catch_as_websocket_error(self) -> None:
-        """Should be catchable as WebSocketError."""
-        with pytest.raises(WebSocketError):
-            raise ConnectionFailedError("Network error")
-
-
-class TestAuthenticationError:
-    """Tests for AuthenticationError exception."""
-
-    def test_inherits_websocket_error(self) -> None:
-        """Should inherit from WebSocketError."""
-        assert issubclass(AuthenticationError, WebSocketError)
-
-    def test_can_be_raised(self) -> None:
-        """Should be raisable."""
-        with pytest.raises(AuthenticationError):
-            raise AuthenticationError("Invalid token")
-
-    def test_message_is_preserved(self) -> None:
-        """Should preserve error message."""
-        error = AuthenticationError("JWT expired")
-        assert str(error) == "JWT expired"
-
-    def test_catch_as_websocket_error(self) -> None:
-        """Should be catchable as WebSocketError."""
-        with pytest.raises(WebSocketError):
-            raise AuthenticationError("Missing credentials")
-
-
-class TestMessageTooLargeError:
-    """Tests for MessageTooLargeError exception."""
+@pytest.mark.parametrize(
+    ("exc_cls", "message"),
+    [
+        (ConnectionFailedError, "Connection refused"),
+        (AuthenticationError, "JWT expired"),
+        (MessageTooLargeError, "Size: 5MB, Max: 1MB"),
+    ],
+    ids=["connection_failed", "authentication", "message_too_large"],
+)
+class TestMessageOnlyErrors:
+    """Tests for the message-only WebSocketError subclasses."""
 
-    def test_inherits_websocket_error(self) -> None:
+    def test_inherits_websocket_error(self, exc_cls: type[WebSocketError], message: str) -> None:
         """Should inherit from WebSocketError."""
-        assert issubclass(MessageTooLargeError, WebSocketError)
+        assert issubclass(exc_cls, WebSocketError)
 
-    def test_can_be_raised(self) -> None:
+    def test_can_be_raised(self, exc_cls: type[WebSocketError], message: str) -> None:
         """Should be raisable."""
-        with pytest.raises(MessageTooLargeError):
-            raise MessageTooLargeError("Message exceeds 1MB limit")
+        with pytest.raises(exc_cls):
+            raise exc_cls(message)
 
-    def test_message_is_preserved(self) -> None:
+    def test_message_is_preserved(self, exc_cls: type[WebSocketError], message: str) -> None:
         """Should preserve error message."""
-        error = MessageTooLargeError("Size: 5MB, Max: 1MB")
-        assert str(error) == "Size: 5MB, Max: 1MB"
+        error = exc_cls(message)
+        assert str(error) == message
 
-    def test_catch_as_websocket_error(self) -> None:
+    def test_catch_as_websocket_error(self, exc_cls: type[WebSocketError], message: str) -> None:
         """Should be catchable as WebSocketError."""
         with pytest.raises(WebSocketError):
-            raise MessageTooLargeError("Too large")
+            raise exc_cls(message)
 
 
 class TestExceptionHierarchy: